@@ -9,10 +9,17 @@ import json
 import time
 import logging
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Keep-alive session: consecutive signals reuse the Groq connection instead
+# of paying a TCP + TLS handshake each. Profiles run on the runner's single
+# alert worker, so one pooled connection is enough.
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+
 
 def profile_market(market_snapshot, signal_data):
     """
@@ -82,7 +89,7 @@ Proposed Signal:
         # Retry with backoff
         for attempt in range(3):
             try:
-                resp = requests.post(
+                resp = _session.post(
                     "https://api.groq.com/openai/v1/chat/completions",
                     headers=headers,
                     json=payload,
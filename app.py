@@ -5,15 +5,17 @@ Tri-Core: MODE_DON v2.2 · RIJIN v3.2 · MODE_VORTEX v1.0
 
 import os
 import sys
-import io
+import atexit
 import threading
 import logging
-from datetime import datetime
-from flask import Flask, render_template, jsonify, Response, request, redirect, session, url_for
+from collections import deque
+from flask import Flask, render_template, jsonify, Response, request, redirect
 from dotenv import load_dotenv, set_key
 from kiteconnect import KiteConnect
 
 import token_manager
+import telegram_alerts
+from engine_runner import TriCoreRunner
 
 load_dotenv()
 
@@ -25,20 +27,29 @@ API_KEY = os.getenv("KITE_API_KEY")
 API_SECRET = os.getenv("KITE_API_SECRET")
 kite = KiteConnect(api_key=API_KEY)
 
-# Log capture
-log_capture_string = io.StringIO()
+# Log capture — only the tail is ever served, so only the tail is kept
+LOG_TAIL_LINES = 200
+log_lines = deque(maxlen=LOG_TAIL_LINES)
 
 
 class LogCatcher:
+    def __init__(self):
+        self._partial = ""   # Text after the last newline
+
     def write(self, data):
-        log_capture_string.write(data)
+        *complete, self._partial = (self._partial + data).split("\n")
+        log_lines.extend(complete)
         sys.__stdout__.write(data)
 
     def flush(self):
         pass
 
+    def tail(self):
+        return "\n".join([*log_lines, self._partial])
+
 
-sys.stdout = LogCatcher()
+log_catcher = LogCatcher()
+sys.stdout = log_catcher
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 
@@ -46,6 +57,8 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 # ENGINE THREAD
 # ===================================================================
 
+ENGINE_EXIT_TIMEOUT = 15    # Seconds to let the engine finish its pass on exit
+
 engine = None
 engine_thread = None
 
@@ -53,7 +66,6 @@ engine_thread = None
 def start_engine():
     """Start the tri-core engine in a background thread."""
     global engine, engine_thread
-    from engine_runner import TriCoreRunner
 
     if engine and engine.running:
         logging.info("Engine already running")
@@ -68,12 +80,27 @@ def start_engine():
 
 def stop_engine():
     """Stop the engine."""
-    global engine
     if engine:
         engine.stop()
         logging.info("🛑 Engine stop requested")
 
 
+def shutdown():
+    """
+    Process exit (gunicorn worker shutdown, Ctrl-C). The engine and the
+    Telegram sender are daemon threads, so without this any queued alert
+    dies with the process.
+    """
+    stop_engine()
+    if engine_thread:
+        engine_thread.join(ENGINE_EXIT_TIMEOUT)
+    if not telegram_alerts.flush():
+        logging.warning("[TELEGRAM] Exit flush timed out, queued messages lost")
+
+
+atexit.register(shutdown)
+
+
 # ===================================================================
 # ROUTES
 # ===================================================================
@@ -146,9 +173,7 @@ def stop_engine_route():
 
 @app.route("/logs")
 def logs():
-    log_content = log_capture_string.getvalue()
-    lines = log_content.split("\n")[-200:]
-    return Response("\n".join(lines), mimetype="text/plain")
+    return Response(log_catcher.tail(), mimetype="text/plain")
 
 
 # ===================================================================
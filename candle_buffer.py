@@ -0,0 +1,342 @@
+"""
+KiteAlerts V6.0 — Candle Buffer
+Per-instrument 5-min candle store. Pre-allocated NumPy columns (SoA),
+filled incrementally: each poll only converts bars that are new or
+still forming. Readers get zero-copy views.
+"""
+
+from operator import itemgetter
+
+import numpy as np
+import kernels
+from kernels import (ST_HIGH, ST_LOW, ST_AVG_GAIN, ST_AVG_LOSS, ST_ATR, ST_EMA, ST_ADX,
+                     ST_CUM_VOL, ST_CUM_PV)
+
+MAX_BARS = 256    # > one full MCX session (09:00–23:30 = 174 bars)
+RSI_PERIOD = 14
+ATR_PERIOD = 14
+ADX_PERIOD = 14
+EMA_PERIOD = 20
+BULK_INGEST_MIN = 32    # Batches this large convert column-wise (backfill, rebuild)
+
+_ohlc = itemgetter('open', 'high', 'low', 'close')
+
+
+class CandleBuffer:
+    """Fixed-capacity OHLCV store for one instrument."""
+
+    __slots__ = (
+        "capacity", "rsi_period", "atr_period", "adx_period", "ema_period",
+        "_store", "_start",
+        "_opens", "_highs", "_lows", "_closes", "_volumes", "_minutes",
+        "dates", "n",
+        "_closed_n", "_state", "_tip_state",
+    )
+
+    def __init__(self, capacity=MAX_BARS, rsi_period=RSI_PERIOD,
+                 atr_period=ATR_PERIOD, ema_period=EMA_PERIOD, adx_period=ADX_PERIOD):
+        self.capacity = capacity
+        self.rsi_period = rsi_period
+        self.atr_period = atr_period
+        self.adx_period = adx_period
+        self.ema_period = ema_period
+        # Prices stay float64: float32 steps ~0.008 at SENSEX levels, which
+        # breaks 2-dp levels and Wilder accumulators. Only the minute
+        # column (0..1439) is narrowed.
+        # Storage is twice the capacity: eviction advances the window start
+        # and the live bars are compacted to the front only when the tail
+        # runs out — once per `capacity` appends instead of on every bar.
+        self._store = (
+            np.empty(2 * capacity, dtype=np.float64),   # open
+            np.empty(2 * capacity, dtype=np.float64),   # high
+            np.empty(2 * capacity, dtype=np.float64),   # low
+            np.empty(2 * capacity, dtype=np.float64),   # close
+            np.empty(2 * capacity, dtype=np.float64),   # volume
+            np.empty(2 * capacity, dtype=np.int16),     # minute of day, -1 if unknown
+        )
+        self._start = 0
+        self._rebind()
+        self.dates = []     # Bar start datetimes, same order as the columns
+        self.n = 0
+        # Running state over the bars before the last one (extremes, VWAP
+        # sums, Wilder RSI/ATR/ADX averages, EMA), advanced by
+        # kernels.fold_running. The last bar may still be forming, so it is
+        # folded in on read, not on write.
+        self._state = np.empty(kernels.STATE_SIZE)
+        self._reset_running()
+
+    def clear(self):
+        self.dates.clear()
+        self.n = 0
+        self._start = 0
+        self._rebind()
+        self._reset_running()
+
+    def _rebind(self):
+        """Point the column attributes at the window starting at _start."""
+        s = self._start
+        (self._opens, self._highs, self._lows,
+         self._closes, self._volumes, self._minutes) = (col[s:] for col in self._store)
+
+    def _reset_running(self):
+        self._closed_n = 0
+        self._tip_state = None
+        self._state[:] = 0.0
+        self._state[ST_HIGH] = -np.inf
+        self._state[ST_LOW] = np.inf
+
+    # ─────────────────────────────────────────────────────
+    # Views (valid until the next ingest)
+    # ─────────────────────────────────────────────────────
+    @property
+    def opens(self):
+        return self._opens[:self.n]
+
+    @property
+    def highs(self):
+        return self._highs[:self.n]
+
+    @property
+    def lows(self):
+        return self._lows[:self.n]
+
+    @property
+    def closes(self):
+        return self._closes[:self.n]
+
+    @property
+    def volumes(self):
+        return self._volumes[:self.n]
+
+    @property
+    def minutes(self):
+        return self._minutes[:self.n]
+
+    @property
+    def last_date(self):
+        return self.dates[-1] if self.n else None
+
+    @property
+    def session_high(self):
+        """Highest high in the buffer — O(1)."""
+        if not self.n:
+            return None
+        return max(self._state[ST_HIGH], self._highs[self.n - 1])
+
+    @property
+    def session_low(self):
+        """Lowest low in the buffer — O(1)."""
+        if not self.n:
+            return None
+        return min(self._state[ST_LOW], self._lows[self.n - 1])
+
+    @property
+    def vwap(self):
+        """VWAP at the last bar — O(1). Same value as indicators.vwap_series()[-1]."""
+        if not self.n:
+            return None
+        tip = self._tip()
+        cum_vol = tip[ST_CUM_VOL]
+        if cum_vol > 0:
+            return tip[ST_CUM_PV] / cum_vol
+        k = self.n - 1
+        return (self._highs[k] + self._lows[k] + self._closes[k]) / 3
+
+    @property
+    def rsi(self):
+        """
+        Wilder RSI of the last bar — O(1): one smoothing step from the
+        committed averages. Same value as indicators.rsi(closes)[-1].
+        """
+        if self.n < self.rsi_period + 1:
+            return 50.0
+        tip = self._tip()
+        avg_gain, avg_loss = tip[ST_AVG_GAIN], tip[ST_AVG_LOSS]
+        return 100.0 if avg_loss == 0 else 100 - (100 / (1 + avg_gain / avg_loss))
+
+    @property
+    def atr(self):
+        """
+        Wilder ATR of the last bar — O(1). Same value as
+        indicators.atr(highs, lows, closes, atr_period)[-1].
+        """
+        if self.n < 2:
+            return 0.0
+        if self.n < self.atr_period:
+            return self._highs[0] - self._lows[0]   # Warm-up: first bar's range
+        return self._tip()[ST_ATR]
+
+    @property
+    def ema(self):
+        """EMA of closes for the last bar — O(1). Same value as indicators.ema()[-1]."""
+        if not self.n:
+            return None
+        if self.n < self.ema_period:
+            return self._closes[0]
+        return self._tip()[ST_EMA]
+
+    @property
+    def adx(self):
+        """
+        Wilder ADX of the last bar — O(1). Same value as
+        indicators.adx(highs, lows, closes, adx_period)[0][-1].
+        """
+        if self.n < 2 * self.adx_period:
+            return 0.0
+        return self._tip()[ST_ADX]
+
+    # ─────────────────────────────────────────────────────
+    # Ingestion
+    # ─────────────────────────────────────────────────────
+    def ingest(self, candles):
+        """
+        Merge a Kite historical_data response.
+
+        The stored last bar (possibly still forming) and anything newer
+        are (re)written; older bars are skipped. The rewritten bar keeps
+        the wider of its stored and new high/low. If the response no
+        longer contains the stored last bar, the buffer is rebuilt from it.
+
+        Returns:
+            int: number of bars written
+        """
+        if not candles:
+            return 0
+
+        start = 0
+        merge = None    # (high, low) of the stored last bar being rewritten
+        if self.n:
+            last_date = self.dates[-1]
+            i = len(candles) - 1
+            while i >= 0 and candles[i]['date'] > last_date:
+                i -= 1
+            if i >= 0 and candles[i]['date'] == last_date:
+                start = i
+                k = self.n - 1
+                merge = (self._highs[k], self._lows[k])
+                self._drop_last()
+            elif i >= 0:
+                self.clear()
+
+        new = candles[start:]
+        if len(new) > self.capacity:
+            new = new[-self.capacity:]
+            merge = None
+        self._make_room(len(new))
+        first = self.n
+
+        if len(new) >= BULK_INGEST_MIN:
+            self._write_bulk(new)
+        else:
+            for c in new:
+                k = self.n
+                self._opens[k] = float(c['open'])
+                self._highs[k] = float(c['high'])
+                self._lows[k] = float(c['low'])
+                self._closes[k] = float(c['close'])
+                self._volumes[k] = float(c.get('volume', 0) or 0)
+                dt = c['date']
+                self._minutes[k] = dt.hour * 60 + dt.minute if hasattr(dt, 'hour') else -1
+                self.dates.append(dt)
+                self.n = k + 1
+
+        # A bar's range only widens: keep extremes that ticks (update_last)
+        # saw before Kite's candle caught up
+        if merge is not None:
+            if merge[0] > self._highs[first]:
+                self._highs[first] = merge[0]
+            if merge[1] < self._lows[first]:
+                self._lows[first] = merge[1]
+
+        # Fold bars that are no longer last into the running state
+        if self._closed_n < self.n - 1:
+            self._fold(self._closed_n, self.n - 1, self._state)
+            self._closed_n = self.n - 1
+        self._tip_state = None
+
+        return len(new)
+
+    def _write_bulk(self, new):
+        """
+        Append a large batch column-wise: one C-level conversion per column
+        instead of a numpy scalar store per field. Per-bar stores stay
+        cheaper for the usual one- or two-bar refresh.
+        """
+        k, stop = self.n, self.n + len(new)
+        rows = np.array([_ohlc(c) for c in new], dtype=np.float64)
+        self._opens[k:stop] = rows[:, 0]
+        self._highs[k:stop] = rows[:, 1]
+        self._lows[k:stop] = rows[:, 2]
+        self._closes[k:stop] = rows[:, 3]
+        self._volumes[k:stop] = np.fromiter((c.get('volume', 0) or 0 for c in new),
+                                            dtype=np.float64, count=len(new))
+        dates = [c['date'] for c in new]
+        self._minutes[k:stop] = np.fromiter(
+            (dt.hour * 60 + dt.minute if hasattr(dt, 'hour') else -1 for dt in dates),
+            dtype=np.int16, count=len(new))
+        self.dates.extend(dates)
+        self.n = stop
+
+    def update_last(self, price):
+        """
+        Fold a live trade price into the forming last bar (close, and the
+        high/low if it extends them). The next ingest rewrites the bar from
+        Kite's own candle (keeping any wider tick extremes), so nothing
+        here reaches the running state directly.
+
+        Returns:
+            bool: False if the bar is unchanged (tick at the current close)
+        """
+        if not self.n:
+            return False
+        k = self.n - 1
+        price = float(price)
+        if price == self._closes[k]:
+            return False    # Close unchanged, so high/low are too; keep the tip cache
+        self._closes[k] = price
+        if price > self._highs[k]:
+            self._highs[k] = price
+        if price < self._lows[k]:
+            self._lows[k] = price
+        self._tip_state = None
+        return True
+
+    def _fold(self, start, stop, state):
+        """Advance `state` over bars [start, stop) — one compiled pass."""
+        kernels.fold_running(self._highs, self._lows, self._closes, self._volumes, start, stop,
+                             self.rsi_period, self.atr_period, self.ema_period, self.adx_period,
+                             state)
+
+    def _tip(self):
+        """
+        Running state with the last (forming) bar folded in, uncommitted.
+        Cached until the buffer next changes.
+        """
+        if self._tip_state is None:
+            tip = self._state.copy()
+            self._fold(self.n - 1, self.n, tip)
+            self._tip_state = tip
+        return self._tip_state
+
+    def _drop_last(self):
+        self.dates.pop()
+        self.n -= 1
+
+    def _make_room(self, k):
+        """Evict the oldest bars so k more fit (k <= capacity)."""
+        start = self._start
+        drop = self.n + k - self.capacity
+        if drop > 0:
+            del self.dates[:drop]
+            self.n -= drop
+            self._start += drop
+            self._reset_running()   # Evicted bars fed the running state; refold
+
+        if self._start + self.n + k > 2 * self.capacity:
+            s = self._start
+            for col in self._store:
+                col[:self.n] = col[s:s + self.n]
+            self._start = 0
+
+        if self._start != start:
+            self._rebind()
@@ -6,6 +6,7 @@ Tri-Core: MODE_DON v2.2 | RIJIN v3.2 | MODE_VORTEX v1.0
 
 import os
 from datetime import time as dtime
+from enum import IntEnum
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -150,6 +151,16 @@ SYSTEM_RISK = {
 }
 
 
+# ===================================================================
+# TRADE DIRECTION
+# ===================================================================
+
+class Direction(IntEnum):
+    """Signed direction — doubles as a price multiplier and a kernel code."""
+    LONG = 1
+    SHORT = -1
+
+
 # ===================================================================
 # DAY TYPE LABELS (9 categories)
 # ===================================================================
@@ -172,6 +183,13 @@ DAY_TYPES = [
 # ===================================================================
 
 CANDLE_INTERVAL = "5minute"
-SCAN_INTERVAL_SECONDS = 30
+CANDLE_SECONDS = 300
+CANDLE_SETTLE_SECONDS = 2      # Refresh this long after a bar closes, so Kite has it
+SCAN_INTERVAL_SECONDS = 30     # REST candle refresh; live prices arrive on the tick stream
+TICK_STREAM_ENABLED = True     # KiteTicker LTP feed between candle refreshes
+TICK_STALE_SECONDS = 30        # Index bars refresh mid-bar over REST only if ticks stop this long
+FETCH_WORKERS = 3              # Concurrent candle fetches (Kite historical API: 3 req/s)
+ERROR_BACKOFF_SECONDS = 5      # Retry delay after a loop error or failed fetch, doubled per repeat...
+ERROR_BACKOFF_MAX_SECONDS = 300  # ...up to this
 MIN_CANDLES_REQUIRED = 50
 MARKET_OPEN = dtime(9, 15)
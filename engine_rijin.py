@@ -8,55 +8,66 @@ The Tactical Adapter
   Gear 3: Momentum Impulse (single candle > 1.5× ATR)
 """
 
-import logging
 import indicators as ind
-from config import RIJIN_CONFIG
-
-
-def scan(candles, instrument_config):
+import kernels
+from config import RIJIN_CONFIG, Direction
+
+# Static config, bound once at import instead of looked up every scan
+_EMA_TREND_PERIOD = RIJIN_CONFIG["ema_trend_period"]
+_PULLBACK_TOLERANCE = RIJIN_CONFIG["gear1_pullback_tolerance"]
+_BB_PERIOD = RIJIN_CONFIG["bollinger_period"]
+_BB_STD = RIJIN_CONFIG["bollinger_std"]
+_RSI_PERIOD = RIJIN_CONFIG["rsi_period"]
+_RSI_OVERBOUGHT = RIJIN_CONFIG["rsi_overbought"]
+_RSI_OVERSOLD = RIJIN_CONFIG["rsi_oversold"]
+_ADX_PERIOD = RIJIN_CONFIG["adx_period"]
+_ADX_TREND_THRESHOLD = RIJIN_CONFIG["adx_trend_threshold"]
+_IMPULSE_ATR_MULTIPLIER = RIJIN_CONFIG["impulse_atr_multiplier"]
+
+
+def scan(buf, instrument_config):
     """
     Scan for RIJIN signal across all 3 gears.
 
     Args:
-        candles: list of candle dicts (5-min)
+        buf: CandleBuffer (5-min)
         instrument_config: dict from config.INSTRUMENTS[name]
 
     Returns:
         dict signal (with gear info) or None
     """
-    cfg = RIJIN_CONFIG
-
-    if len(candles) < 50:
+    if buf.n < 50:
         return None
 
-    highs = [float(c['high']) for c in candles]
-    lows = [float(c['low']) for c in candles]
-    closes = [float(c['close']) for c in candles]
-    opens = [float(c['open']) for c in candles]
+    # Plain lists for the pure-Python checks — only the trailing window they
+    # read (Bollinger windows for the last two bars, 4-bar swing)
+    tail = max(_BB_PERIOD + 1, 5)
+    highs = buf.highs[-tail:].tolist()
+    lows = buf.lows[-tail:].tolist()
+    closes = buf.closes[-tail:].tolist()
 
     price = closes[-1]
-    candle_open = opens[-1]
+    candle_open = float(buf.opens[-1])
     candle_high = highs[-1]
     candle_low = lows[-1]
 
-    # Indicators
-    ema20 = ind.ema(closes, cfg["ema_trend_period"])
-    e20 = ema20[-1]
-    atr_vals = ind.atr(highs, lows, closes)
-    current_atr = atr_vals[-1]
-    vwap_vals = ind.vwap(candles)
-    current_vwap = vwap_vals[-1]
-    rsi_vals = ind.rsi(closes, cfg["rsi_period"])
-    current_rsi = rsi_vals[-1]
-    adx_vals, plus_di, minus_di = ind.adx(highs, lows, closes, cfg["adx_period"])
-    current_adx = adx_vals[-1]
-    bb_upper, bb_mid, bb_lower = ind.bollinger_bands(closes, cfg["bollinger_period"], cfg["bollinger_std"])
-
-    # Structure check: Higher Highs / Lower Lows
-    recent_highs = highs[-10:]
-    recent_lows = lows[-10:]
-    making_hh = len(recent_highs) >= 5 and recent_highs[-1] > max(recent_highs[-5:-1])
-    making_ll = len(recent_lows) >= 5 and recent_lows[-1] < min(recent_lows[-5:-1])
+    # Indicators — EMA / ATR / RSI / ADX / VWAP come from the buffer's incremental
+    # state; other periods take one compiled pass over the columns
+    if (_EMA_TREND_PERIOD, _RSI_PERIOD, _ADX_PERIOD) == (buf.ema_period, buf.rsi_period, buf.adx_period):
+        e20, current_rsi, current_adx = buf.ema, buf.rsi, buf.adx
+    else:
+        last = ind.last_values(buf.highs, buf.lows, buf.closes, rsi_period=_RSI_PERIOD,
+                               atr_period=buf.atr_period, ema_period=_EMA_TREND_PERIOD,
+                               adx_period=_ADX_PERIOD)
+        e20, current_rsi, current_adx = last.ema, last.rsi, last.adx
+    current_atr = buf.atr
+    current_vwap = buf.vwap
+
+    # Structure check: Higher Highs / Lower Lows vs. the prior 4-candle swing
+    swing_high = max(highs[-5:-1])
+    swing_low = min(lows[-5:-1])
+    making_hh = candle_high > swing_high
+    making_ll = candle_low < swing_low
 
     # Is candle green/red?
     is_green = price > candle_open
@@ -66,24 +77,19 @@ def scan(candles, instrument_config):
     # GEAR 3: MOMENTUM IMPULSE (check first — speed matters)
     # Single candle body > 1.5× ATR
     # ─────────────────────────────────────────────────────
-    body = abs(price - candle_open)
-    if current_atr > 0 and body > cfg["impulse_atr_multiplier"] * current_atr:
-        if is_green:
-            sl = price - 1.0 * current_atr
-            target = price + 1.5 * current_atr
-            return _signal("RIJIN Gear 3 (Impulse)", "LONG", price, sl, target,
-                           current_atr, current_rsi, current_adx)
-        elif is_red:
-            sl = price + 1.0 * current_atr
-            target = price - 1.5 * current_atr
-            return _signal("RIJIN Gear 3 (Impulse)", "SHORT", price, sl, target,
-                           current_atr, current_rsi, current_adx)
+    impulse = kernels.impulse_direction(candle_open, price, current_atr, _IMPULSE_ATR_MULTIPLIER)
+    if impulse:
+        # impulse is the direction sign (+1 / -1): stop behind, target ahead
+        sl = price - impulse * 1.0 * current_atr
+        target = price + impulse * 1.5 * current_atr
+        return _signal("RIJIN Gear 3 (Impulse)", Direction(impulse).name, price, sl, target,
+                       current_atr, current_rsi, current_adx)
 
     # ─────────────────────────────────────────────────────
     # GEAR 1: TREND PULLBACK
     # Price > VWAP, making HH, pulls back to EMA20, closes green
     # ─────────────────────────────────────────────────────
-    tolerance = e20 * cfg["gear1_pullback_tolerance"]
+    tolerance = e20 * _PULLBACK_TOLERANCE
 
     # Long
     if price > current_vwap and making_hh:
@@ -106,17 +112,21 @@ def scan(candles, instrument_config):
     # Price breaks Bollinger, RSI extreme, closes BACK inside band
     # ADX Lock: disabled if ADX > 25
     # ─────────────────────────────────────────────────────
-    if current_adx <= cfg["adx_trend_threshold"]:
+    # Bands are only built when ADX and RSI leave a reversion possible
+    rsi_extreme = current_rsi < _RSI_OVERSOLD or current_rsi > _RSI_OVERBOUGHT
+    if current_adx <= _ADX_TREND_THRESHOLD and rsi_extreme:
+        bb_upper, bb_mid, bb_lower = ind.bollinger_tail(closes, _BB_PERIOD, _BB_STD)
+
         # Long: price was below lower BB, RSI oversold, closes back inside
-        prev_close = closes[-2] if len(closes) > 1 else price
-        if prev_close < bb_lower[-2] and price > bb_lower[-1] and current_rsi < cfg["rsi_oversold"]:
+        prev_close = closes[-2]   # buf.n >= 50, checked on entry
+        if prev_close < bb_lower[-2] and price > bb_lower[-1] and current_rsi < _RSI_OVERSOLD:
             sl = candle_low - 0.3 * current_atr
             target = bb_mid[-1]  # Target: mid-band
             return _signal("RIJIN Gear 2 (Reversion)", "LONG", price, sl, target,
                            current_atr, current_rsi, current_adx)
 
         # Short: price was above upper BB, RSI overbought, closes back inside
-        if prev_close > bb_upper[-2] and price < bb_upper[-1] and current_rsi > cfg["rsi_overbought"]:
+        if prev_close > bb_upper[-2] and price < bb_upper[-1] and current_rsi > _RSI_OVERBOUGHT:
             sl = candle_high + 0.3 * current_atr
             target = bb_mid[-1]
             return _signal("RIJIN Gear 2 (Reversion)", "SHORT", price, sl, target,
@@ -8,17 +8,24 @@ import os
 import logging
 import threading
 import time as _time
-from datetime import datetime, timedelta, time as dtime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
 import pytz
+import requests
 from dotenv import load_dotenv
+from urllib3.util import Retry
 from kiteconnect import KiteConnect
+from kiteconnect.exceptions import KiteException
 
 import config
 import indicators as ind
+import kernels
+from candle_buffer import CandleBuffer
 import engine_mode_don
 import engine_rijin
 import engine_vortex
 import day_profiler
+from tick_stream import LtpStream
 import ai_profiler
 import telegram_alerts
 import token_manager
@@ -32,27 +39,78 @@ def now_ist():
     return datetime.now(IST)
 
 
+def seconds_of_day(t):
+    """time or datetime → seconds since midnight (microseconds kept as a fraction)."""
+    return t.hour * 3600 + t.minute * 60 + t.second + t.microsecond / 1e6
+
+
+def seconds_to_refresh(now):
+    """
+    Seconds until the next candle refresh: SCAN_INTERVAL_SECONDS, pulled in
+    to land CANDLE_SETTLE_SECONDS after the next 5-min bar closes.
+    """
+    into_bar = seconds_of_day(now) % config.CANDLE_SECONDS
+    to_close = (config.CANDLE_SETTLE_SECONDS - into_bar) % config.CANDLE_SECONDS
+    return min(config.SCAN_INTERVAL_SECONDS, to_close or config.CANDLE_SECONDS)
+
+
 class InstrumentState:
     """Per-instrument runtime state."""
 
+    # Read on every tick for every instrument — no per-instance __dict__
+    __slots__ = (
+        "name", "config", "instrument_token", "buffer", "active_trade",
+        "daily_trades", "daily_pnl_r", "consecutive_losses", "disabled",
+        "last_signal_candle", "last_scan_key", "window", "blackout",
+        "blackout_today", "expiry_warning_at", "last_tick", "last_tick_scan",
+    )
+
     def __init__(self, name, cfg):
         self.name = name
         self.config = cfg
         self.instrument_token = None
+        self.buffer = CandleBuffer()
         self.active_trade = None
         self.daily_trades = 0
         self.daily_pnl_r = 0.0
         self.consecutive_losses = 0
         self.disabled = False
         self.last_signal_candle = None  # Prevent double-fire on same candle
-
-    def reset_daily(self):
+        self.last_scan_key = None       # Last-bar state the engines last saw
+        self.last_tick = 0.0            # monotonic time of the latest stream tick
+        self.last_tick_scan = 0.0       # monotonic time of the latest tick-driven scan
+
+        # Gate constants, resolved once as seconds of day:
+        # (start, end) and (weekday, start, end) or None
+        start, end = cfg["active_window"]
+        self.window = (seconds_of_day(start), seconds_of_day(end))
+        self.blackout = None
+        if name == "CRUDEOIL" and cfg.get("inventory_blackout_day") is not None:
+            self.blackout = (cfg["inventory_blackout_day"],
+                             seconds_of_day(cfg["inventory_blackout_start"]),
+                             seconds_of_day(cfg["inventory_blackout_end"]))
+
+        # Resolved for the current weekday by reset_daily
+        self.blackout_today = None      # (start, end) or None
+        self.expiry_warning_at = None   # seconds of day or None
+
+    def reset_daily(self, weekday):
+        self.buffer.clear()
         self.active_trade = None
         self.daily_trades = 0
         self.daily_pnl_r = 0.0
         self.consecutive_losses = 0
         self.disabled = False
         self.last_signal_candle = None
+        self.last_scan_key = None
+
+        # Weekday rules collapse to plain second ranges for the day
+        blackout = self.blackout
+        self.blackout_today = blackout[1:] if blackout and blackout[0] == weekday else None
+        warning_after = self.config.get("expiry_warning_after")
+        self.expiry_warning_at = None
+        if self.config.get("expiry_day") == weekday and warning_after:
+            self.expiry_warning_at = seconds_of_day(warning_after)
 
 
 class TriCoreRunner:
@@ -61,8 +119,14 @@ class TriCoreRunner:
     def __init__(self, stop_event=None):
         self._stop_event = stop_event or threading.Event()
 
-        # Kite
-        self.kite = KiteConnect(api_key=os.getenv("KITE_API_KEY"))
+        # Kite — one keep-alive connection per fetch worker. Idempotent GETs
+        # retry once a pooled connection turns out to have been dropped
+        # while idle (overnight, between sessions).
+        self.kite = KiteConnect(api_key=os.getenv("KITE_API_KEY"), pool={
+            "pool_connections": 1,
+            "pool_maxsize": config.FETCH_WORKERS,
+            "max_retries": Retry(total=2, backoff_factor=0.3, allowed_methods=frozenset({"GET"})),
+        })
         self.kite.set_access_token(os.getenv("KITE_ACCESS_TOKEN"))
 
         # Instruments
@@ -70,6 +134,25 @@ class TriCoreRunner:
         for name, cfg in config.INSTRUMENTS.items():
             self.instruments[name] = InstrumentState(name, cfg)
 
+        # Candle fetches are I/O-bound — run each pass's fetches concurrently
+        self._fetch_pool = ThreadPoolExecutor(max_workers=config.FETCH_WORKERS,
+                                              thread_name_prefix="CandleFetch")
+
+        # Signal alerts wait on the AI profiler (seconds, more on retries) —
+        # one worker sends them in order while the loop keeps scanning
+        self._alert_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="SignalAlert")
+
+        # Live LTP feed (None → REST polling only). While it runs, candle
+        # fetches are in flight on the pool and land between ticks.
+        self._stream = None
+        self._pending = []          # [(InstrumentState, Future)]
+        self._next_fetch = 0.0      # monotonic time of the next REST refresh
+        self._bar_start = None      # Current 5-min bar [start, end), kept until the clock leaves it
+        self._bar_end = None
+        self._backoff = config.ERROR_BACKOFF_SECONDS   # Main-loop error retry delay
+        self._fetch_backoff = config.ERROR_BACKOFF_SECONDS   # Added to the refresh while fetches fail
+        self._fetch_failed = False  # A fetch of the current batch failed (rate limit, network)
+
         # System state
         self.system_pnl_r = 0.0
         self.system_stopped = False
@@ -78,30 +161,172 @@ class TriCoreRunner:
 
     def stop(self):
         self._stop_event.set()
+        stream = self._stream
+        if stream:
+            stream.wake.set()
 
     def _resolve_tokens(self):
         """Resolve Kite instrument tokens for all instruments."""
         try:
-            all_instruments = self.kite.instruments()
+            wanted = {}
             for name, inst in self.instruments.items():
-                kite_symbol = inst.config["kite_symbol"]
-                parts = kite_symbol.split(":")
-                if len(parts) != 2:
-                    continue
-                exchange, tradingsymbol = parts[0], parts[1]
-                for ki in all_instruments:
-                    if ki["exchange"] == exchange and ki["tradingsymbol"] == tradingsymbol:
-                        inst.instrument_token = ki["instrument_token"]
-                        logging.info(f"✅ [{name}] Token resolved: {inst.instrument_token}")
-                        break
+                parts = inst.config["kite_symbol"].split(":")
+                if len(parts) == 2:
+                    wanted[name] = (parts[0], parts[1])
+
+            # One dump per exchange we trade, indexed by (exchange, tradingsymbol)
+            token_index = {}
+            for exchange in {exchange for exchange, _ in wanted.values()}:
+                for ki in self.kite.instruments(exchange):
+                    token_index[(ki["exchange"], ki["tradingsymbol"])] = ki["instrument_token"]
+
+            resolved = []
+            for name, key in wanted.items():
+                inst = self.instruments[name]
+                inst.instrument_token = token_index.get(key)
+                if inst.instrument_token:
+                    resolved.append(f"✅ [{name}] Token resolved: {inst.instrument_token}")
                 else:
-                    logging.error(f"❌ [{name}] Could not resolve: {kite_symbol}")
+                    logging.error("❌ [%s] Could not resolve: %s", name, inst.config['kite_symbol'])
+            if resolved:
+                logging.info("\n".join(resolved))   # One record (one handler lock) for the batch
         except Exception as e:
-            logging.error(f"Token resolution failed: {e}")
+            logging.error("Token resolution failed: %s", e)
             token_manager.handle_api_error(e, "resolve_tokens")
 
+    def _start_stream(self):
+        """Open the LTP websocket for resolved instruments. On failure, poll only."""
+        tokens = [i.instrument_token for i in self.instruments.values() if i.instrument_token]
+        if not config.TICK_STREAM_ENABLED or not tokens:
+            return
+        try:
+            stream = LtpStream(os.getenv("KITE_API_KEY"), self.kite.access_token, tokens)
+            stream.start()
+        except Exception as e:
+            logging.error("Tick stream unavailable, polling only: %s", e)
+            return
+        self._stream = stream
+
+    def _seconds_to_next_gate(self, current_seconds):
+        """Seconds until any instrument's window or blackout next opens or closes."""
+        # Starts take effect on the second; inclusive ends just after it
+        bounds = []
+        for inst in self.instruments.values():
+            start, end = inst.window
+            bounds += (start, end + 0.001)
+            if inst.blackout:
+                _, start, end = inst.blackout
+                bounds += (start, end + 0.001)
+        ahead = [b - current_seconds for b in bounds if b > current_seconds]
+        return min(ahead) if ahead else min(bounds) + 86400 - current_seconds
+
+    def _poll_due(self, due):
+        """
+        Polling: fetch every due instrument now. Each is ingested and
+        scanned as soon as its response lands, while the rest are in flight.
+        """
+        # From the stored last bar onward (the whole session on an empty buffer)
+        futures = {self._fetch_pool.submit(self._fetch_candles, inst.instrument_token,
+                                           inst.buffer.last_date): inst
+                   for inst in due}
+        self._fetch_failed = False
+        for future in as_completed(futures):
+            inst = futures[future]
+            data = future.result()
+            if data is None:
+                self._fetch_failed = True
+                continue
+            inst.buffer.ingest(data)   # Only new/forming bars are converted
+            yield inst
+
+    def _stream_due(self, due, stream, now):
+        """
+        Streaming: REST candles refresh in the background on the scan
+        interval and are ingested whenever they land; ticks move the
+        forming bar in between. Yields the due instruments to scan: every
+        REST landing, and tick-moved index feeds once per scan interval.
+        """
+        mono = _time.monotonic()
+        # The bar start moves once per bar: two compares instead of a
+        # tz-aware replace() on every tick pass
+        bar_start = self._bar_start
+        if bar_start is None or not bar_start <= now < self._bar_end:
+            bar_start = now.replace(minute=now.minute - now.minute % 5, second=0, microsecond=0)
+            self._bar_start = bar_start
+            self._bar_end = bar_start + timedelta(seconds=config.CANDLE_SECONDS)
+        if not self._pending and mono >= self._next_fetch:
+            self._fetch_failed = False
+            for inst in due:
+                # LTP ticks carry everything a mid-bar refresh would for a
+                # volume-less (index) feed; REST then only brings each new
+                # bar, or steps in when the ticks go quiet
+                buf = inst.buffer
+                if (buf.last_date == bar_start and not buf.volumes.any()
+                        and mono - inst.last_tick < config.TICK_STALE_SECONDS):
+                    continue
+                future = self._fetch_pool.submit(self._fetch_candles, inst.instrument_token,
+                                                 inst.buffer.last_date)
+                future.add_done_callback(lambda _: stream.wake.set())
+                self._pending.append((inst, future))
+            self._next_fetch = mono + seconds_to_refresh(now)   # This pass's clock, like mono
+
+        ticks = stream.drain()
+        done, in_flight = [], []
+        for entry in self._pending:
+            (done if entry[1].done() else in_flight).append(entry)
+        self._pending = in_flight   # Before result(): a raising fetch must not be retried forever
+
+        landed = set()
+        for inst, future in done:
+            data = future.result()
+            if data is None:
+                self._fetch_failed = True
+                continue
+            inst.buffer.ingest(data)
+            landed.add(inst.name)
+        if done and not self._pending:     # The batch has landed: back off once for it
+            delay = self._fetch_retry_delay(self._fetch_failed)
+            if delay:
+                self._next_fetch = mono + seconds_to_refresh(now) + delay
+
+        for inst in due:
+            ltp = ticks.get(inst.instrument_token)
+            if ltp is not None:
+                inst.last_tick = mono
+            if inst.name in landed:
+                yield inst
+                continue
+            # Tick into the forming bar; a new bar waits for its REST candle
+            buf = inst.buffer
+            if ltp is None or buf.last_date != bar_start or not buf.update_last(ltp):
+                continue        # A tick at the current close changes nothing
+            # Ticks carry no volume, so feeds with volume scan when their REST
+            # candle lands. Volume-less (index) feeds scan on ticks, at most
+            # once per poll interval — the polling cadence, with fresher prices.
+            if mono - inst.last_tick_scan >= config.SCAN_INTERVAL_SECONDS and not buf.volumes.any():
+                inst.last_tick_scan = mono
+                yield inst
+
+    def _fetch_retry_delay(self, failed):
+        """
+        Extra wait before the next candle refresh after a batch of fetches
+        landed: 0 if they all succeeded (the backoff resets), else the current
+        backoff, doubled for the next failing batch.
+        """
+        if not failed:
+            self._fetch_backoff = config.ERROR_BACKOFF_SECONDS
+            return 0
+        delay = self._fetch_backoff
+        self._fetch_backoff = min(delay * 2, config.ERROR_BACKOFF_MAX_SECONDS)
+        logging.warning("Candle fetch failed, next refresh backs off %ds", delay)
+        return delay
+
     def _fetch_candles(self, instrument_token, from_time=None):
-        """Fetch 5-min candles."""
+        """
+        Fetch 5-min candles from from_time (default: session start, 09:00).
+        Passing the buffer's last bar date returns that bar plus anything newer.
+        None if the request failed (rate limit, network, API error).
+        """
         try:
             now = now_ist()
             if from_time is None:
@@ -114,41 +339,31 @@ class TriCoreRunner:
                 config.CANDLE_INTERVAL,
             )
             return data
-        except Exception as e:
+        except (KiteException, requests.RequestException) as e:
+            # API / network failures skip this refresh and back off the next
+            # one; anything else is a bug and surfaces in the main loop's handler
             token_manager.handle_api_error(e, "fetch_candles")
-            logging.error(f"Candle fetch error: {e}")
-            return []
-
-    def _is_in_window(self, inst, now_time):
-        """Check if current time is within instrument's active window."""
-        start, end = inst.config["active_window"]
-        return start <= now_time <= end
-
-    def _is_inventory_blackout(self, inst, now):
-        """Check Crude Oil inventory blackout (Wed 7:45-8:45 PM)."""
-        if inst.name != "CRUDEOIL":
-            return False
-        blackout_day = inst.config.get("inventory_blackout_day")
-        if blackout_day is None or now.weekday() != blackout_day:
-            return False
-        t = now.time()
-        return inst.config["inventory_blackout_start"] <= t <= inst.config["inventory_blackout_end"]
+            logging.error("Candle fetch error: %s", e)
+            return None
 
     def _get_expiry_warning(self, inst, now):
         """Check if expiry warning should be appended."""
-        expiry_day = inst.config.get("expiry_day")
-        if expiry_day is None or now.weekday() != expiry_day:
-            return None
-        warning_after = inst.config.get("expiry_warning_after")
-        if warning_after and now.time() >= warning_after:
+        warning_at = inst.expiry_warning_at     # None unless today is expiry day
+        if warning_at is not None and seconds_of_day(now) >= warning_at:
             return "⚠️ EXPIRY WARNING — Gamma spike risk elevated. Reduce size."
         return None
 
-    def _build_market_snapshot(self, candles, highs, lows, closes, volumes, atr_val, rsi_val, adx_val, vwap_val):
+    def _build_market_snapshot(self, buf, indicators):
         """Build the JSON snapshot fed to both profilers."""
-        price = closes[-1]
+        atr_val = indicators.atr
+        rsi_val = indicators.rsi
+        adx_val = indicators.adx
+        vwap_val = indicators.vwap[-1]
+        price = buf.closes[-1]
         vwap_dist = (price - vwap_val) / vwap_val * 100 if vwap_val > 0 else 0
-        session_range = max(highs) - min(lows)
+        session_high = float(buf.session_high)
+        session_low = float(buf.session_low)
+        session_range = session_high - session_low
 
         return {
             "price": round(price, 2),
@@ -158,65 +373,76 @@ class TriCoreRunner:
             "vwap": round(vwap_val, 2),
             "vwap_distance_pct": round(vwap_dist, 3),
             "session_range": round(session_range, 2),
-            "session_high": round(max(highs), 2),
-            "session_low": round(min(lows), 2),
-            "candle_count": len(candles),
+            "session_high": round(session_high, 2),
+            "session_low": round(session_low, 2),
+            "candle_count": buf.n,
         }
 
-    def _process_signal(self, inst, signal, candles, highs, lows, closes, volumes, now):
-        """Process a signal: run dual profiler → fire Telegram alert."""
-        # Indicators for snapshot
-        atr_val = ind.atr(highs, lows, closes)[-1]
-        rsi_val = ind.rsi(closes)[-1]
-        adx_vals = ind.adx(highs, lows, closes)[0]
-        adx_val = adx_vals[-1]
-        vwap_val = ind.vwap(candles)[-1]
-
-        snapshot = self._build_market_snapshot(
-            candles, highs, lows, closes, volumes,
-            atr_val, rsi_val, adx_val, vwap_val
-        )
+    def _process_signal(self, inst, signal, highs, lows, closes, volumes, now):
+        """
+        Process a signal: math profile here (it reads the buffer views),
+        then AI profile → Telegram alert on the alert worker.
+        """
+        # Indicators — computed once, shared by the snapshot and the math profiler
+        buf = inst.buffer
+        indicators = ind.compute_snapshot(highs, lows, closes, volumes,
+                                          buf.rsi, buf.atr, buf.adx)
 
-        # Math Profiler
-        math_profile = day_profiler.classify_day(candles, highs, lows, closes, volumes, now)
+        snapshot = self._build_market_snapshot(inst.buffer, indicators)
 
-        # AI Profiler (async-safe, fail-open)
-        ai_profile = ai_profiler.profile_market(snapshot, signal)
+        # Math Profiler (fails open on its own)
+        math_profile = day_profiler.classify_day(None, highs, lows, closes, volumes, now, indicators,
+                                                 buf.minutes)
 
         # Expiry warning
         extra = self._get_expiry_warning(inst, now)
 
-        # Fire Telegram
-        telegram_alerts.send_signal_alert(
-            instrument=inst.config["display_name"],
-            engine=signal["engine"],
-            direction=signal["direction"],
-            entry=signal["entry"],
-            sl=signal["sl"],
-            target=signal["target"],
-            math_profile=math_profile,
-            ai_profile=ai_profile,
-            extra_info=extra,
-        )
-
-        logging.info(
-            f"🚨 SIGNAL FIRED: {inst.name} | {signal['engine']} | {signal['direction']} | "
-            f"Entry: {signal['entry']} | Math: {math_profile['tag']} | AI: {ai_profile['tag']}"
-        )
+        self._alert_pool.submit(self._send_signal_alert, inst, signal, snapshot, math_profile, extra)
 
         # Track (no position management — manual execution)
         inst.daily_trades += 1
-        inst.last_signal_candle = candles[-1]['date'] if candles else None
+        inst.last_signal_candle = buf.last_date
+
+    def _send_signal_alert(self, inst, signal, snapshot, math_profile, extra):
+        """Alert worker: AI profiler (fail-open) → Telegram."""
+        try:
+            ai_profile = ai_profiler.profile_market(snapshot, signal)
+
+            telegram_alerts.send_signal_alert(
+                instrument=inst.config["display_name"],
+                engine=signal["engine"],
+                direction=signal["direction"],
+                entry=signal["entry"],
+                sl=signal["sl"],
+                target=signal["target"],
+                math_profile=math_profile,
+                ai_profile=ai_profile,
+                extra_info=extra,
+            )
+
+            logging.info(
+                "🚨 SIGNAL FIRED: %s | %s | %s | Entry: %s | Math: %s | AI: %s",
+                inst.name, signal["engine"], signal["direction"],
+                signal["entry"], math_profile["tag"], ai_profile["tag"],
+            )
+        except Exception as e:
+            logging.exception("Signal alert error: %s", e)
 
     def run(self):
         """Main engine loop."""
         self.running = True
         logging.info("🚀 KiteAlerts V6.0 Tri-Core Engine starting...")
 
+        # Pay any JIT compile cost now, not on the first market tick
+        t0 = _time.monotonic()
+        kernels.warmup()
+        logging.info("⚙️ Kernels ready in %.2fs (%s)", _time.monotonic() - t0,
+                     "numba" if kernels.NUMBA_ENABLED else "pure Python")
+
         # Resolve instrument tokens
         self._resolve_tokens()
         resolved = sum(1 for i in self.instruments.values() if i.instrument_token)
-        logging.info(f"📊 Resolved {resolved}/{len(self.instruments)} instruments")
+        logging.info("📊 Resolved %d/%d instruments", resolved, len(self.instruments))
 
         if resolved == 0:
             logging.error("❌ No instruments resolved. Check token and .env")
@@ -234,89 +460,140 @@ class TriCoreRunner:
             f"Mode: Manual Execution"
         )
 
-        while not self._stop_event.is_set():
+        self._start_stream()
+
+        # Hot-path names, bound once for the loop
+        instruments = tuple(self.instruments.values())
+        min_candles = config.MIN_CANDLES_REQUIRED
+        engine_scans = (engine_mode_don.scan, engine_rijin.scan, engine_vortex.scan)
+        stopped = self._stop_event.is_set
+        stop_wait = self._stop_event.wait
+
+        while not stopped():
             try:
                 now = now_ist()
                 current_date = now.date()
-                current_time = now.time()
+                current_seconds = seconds_of_day(now)   # Once per pass; gates compare numbers
 
                 # Daily reset
                 if self.today != current_date:
                     self.today = current_date
                     self.system_pnl_r = 0.0
                     self.system_stopped = False
-                    for inst in self.instruments.values():
-                        inst.reset_daily()
+                    weekday = now.weekday()
+                    for inst in instruments:
+                        inst.reset_daily(weekday)
+                    self._pending = []      # A late landing would refill a cleared buffer
                     token_manager.reset_daily_alert()
-                    logging.info(f"📅 New day: {current_date}")
+                    logging.info("📅 New day: %s", current_date)
 
                 # System-level stop
                 if self.system_stopped:
-                    self._stop_event.wait(60)
+                    stop_wait(60)
                     continue
 
-                # Scan each instrument
-                for name, inst in self.instruments.items():
+                # Gate each instrument (cheap checks only)
+                due = []
+                for inst in instruments:
                     if not inst.instrument_token or inst.disabled:
                         continue
 
                     # Time gate
-                    if not self._is_in_window(inst, current_time):
+                    start, end = inst.window
+                    if not start <= current_seconds <= end:
                         continue
 
-                    # Crude oil inventory blackout
-                    if self._is_inventory_blackout(inst, now):
+                    # Crude oil inventory blackout (Wed 7:45-8:45 PM)
+                    blackout = inst.blackout_today
+                    if blackout and blackout[0] <= current_seconds <= blackout[1]:
                         continue
 
-                    # Fetch candles
-                    candles = self._fetch_candles(inst.instrument_token)
-                    if len(candles) < config.MIN_CANDLES_REQUIRED:
+                    due.append(inst)
+
+                # Gates only flip at window / blackout boundaries — with nothing
+                # due, sleep straight to the next one
+                stream = self._stream
+                if not due:
+                    if stream:
+                        stream.drain()      # Off-window ticks are never applied
+                    # Off-window instruments stay subscribed and their ticks keep
+                    # setting stream.wake, so idle on the stop event instead
+                    stop_wait(self._seconds_to_next_gate(current_seconds))
+                    continue
+
+                # Bring buffers up to date: REST candles, plus live ticks when streaming
+                if stream is None:
+                    updated = self._poll_due(due)
+                else:
+                    updated = self._stream_due(due, stream, now)
+
+                # Scan each updated instrument
+                for inst in updated:
+                    buf = inst.buffer
+                    if buf.n < min_candles:
                         continue
 
                     # Prevent double-fire on same candle
-                    candle_time = candles[-1]['date']
+                    candle_time = buf.last_date
                     if inst.last_signal_candle == candle_time:
                         continue
 
-                    # Extract arrays
-                    highs = [float(c['high']) for c in candles]
-                    lows = [float(c['low']) for c in candles]
-                    closes = [float(c['close']) for c in candles]
-                    volumes = [float(c.get('volume', 0) or 0) for c in candles]
-
-                    # Run all 3 engines — first signal wins
-                    signal = None
-
-                    # Engine A: MODE_DON
-                    signal = engine_mode_don.scan(candles, inst.config)
+                    # Column views from the buffer
+                    highs = buf.highs
+                    lows = buf.lows
+                    closes = buf.closes
+                    volumes = buf.volumes
 
-                    # Engine B: RIJIN
-                    if not signal:
-                        signal = engine_rijin.scan(candles, inst.config)
+                    # Engines are pure functions of the candles — skip if nothing moved
+                    scan_key = (buf.n, candle_time, buf.opens[-1], highs[-1],
+                                lows[-1], closes[-1], volumes[-1])
+                    if inst.last_scan_key == scan_key:
+                        continue
 
-                    # Engine C: VORTEX
-                    if not signal:
-                        signal = engine_vortex.scan(candles, inst.config)
+                    # Run all 3 engines (MODE_DON → RIJIN → VORTEX) — first signal wins
+                    signal = None
+                    for engine_scan in engine_scans:
+                        signal = engine_scan(buf, inst.config)
+                        if signal:
+                            break
 
                     # Process signal
                     if signal:
-                        self._process_signal(inst, signal, candles, highs, lows, closes, volumes, now)
+                        self._process_signal(inst, signal, highs, lows, closes, volumes, now)
 
-                # Sleep between scans
-                self._stop_event.wait(config.SCAN_INTERVAL_SECONDS)
+                    inst.last_scan_key = scan_key
+
+                self._backoff = config.ERROR_BACKOFF_SECONDS   # Clean pass
+
+                # Sleep until the next tick or candle refresh. While fetches are
+                # in flight no refresh can start, so wait for a tick or a landing
+                # (done-callbacks set wake) instead of spinning past _next_fetch
+                if stream:
+                    stream.wake.wait(None if self._pending
+                                     else max(0.0, self._next_fetch - _time.monotonic()))
+                else:
+                    delay = self._fetch_retry_delay(self._fetch_failed)
+                    stop_wait(seconds_to_refresh(now_ist()) + delay)   # Fresh clock: fetches took time
 
             except KeyboardInterrupt:
                 logging.info("Shutting down...")
                 break
             except Exception as e:
-                logging.error(f"Main loop error: {e}")
-                import traceback
-                traceback.print_exc()
-                self._stop_event.wait(60)
-
+                logging.error("Main loop error: %s", e)
+                logging.debug("Main loop traceback", exc_info=True)
+                # Repeating errors back off exponentially (fetch failures
+                # back off the refresh instead, see _fetch_retry_delay)
+                stop_wait(self._backoff)
+                self._backoff = min(self._backoff * 2, config.ERROR_BACKOFF_MAX_SECONDS)
+
+        if self._stream:
+            self._stream.close()
+        self._fetch_pool.shutdown(wait=False)
+        self._alert_pool.shutdown(wait=True)     # Signals already found still go out
         self.running = False
         logging.info("🛑 Tri-Core Engine stopped")
         telegram_alerts.send_system_alert("🛑 V6.0 STOPPED", "Engine shut down.")
+        telegram_alerts.flush()
 
     def get_stats(self):
         """Dashboard stats."""
@@ -343,4 +620,12 @@ class TriCoreRunner:
         """Update access token for all Kite connections."""
         self.kite.set_access_token(new_token)
         self._resolve_tokens()
+
+        # The websocket authenticates at connect — reopen it with the new token
+        old, self._stream = self._stream, None
+        if old:
+            old.close()
+            old.wake.set()
+        if self.running:
+            self._start_stream()
         logging.info("🔑 Token refreshed for all instruments")
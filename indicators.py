@@ -3,7 +3,22 @@ KiteAlerts V6.0 — Indicator Library
 Pure functions. No state. No side effects.
 """
 
+from collections import namedtuple
+
 import numpy as np
+import kernels
+
+# Latest-bar indicator values, computed once and shared by the runner and
+# the day profiler. `vwap` is the full series (the profiler walks it).
+IndicatorSnapshot = namedtuple("IndicatorSnapshot", ["atr", "rsi", "adx", "vwap"])
+
+# Last-bar values of rsi() / atr() / ema() / adx()[0], see last_values()
+LastValues = namedtuple("LastValues", ["rsi", "atr", "ema", "adx"])
+
+
+def _as_array(data):
+    """Contiguous float64 view/copy of a series for kernel calls."""
+    return np.ascontiguousarray(data, dtype=np.float64)
 
 
 def ema(data, period):
@@ -171,6 +186,28 @@ def bollinger_bands(closes, period=20, std_dev=2.0):
     return upper, middle, lower
 
 
+def bollinger_tail(closes, period=20, std_dev=2.0, count=2):
+    """
+    Last `count` values of bollinger_bands() as (upper, middle, lower).
+    Earlier bars' bands don't move while the last bar forms, so only the
+    trailing windows are computed.
+    """
+    upper = []
+    middle = []
+    lower = []
+    for i in range(max(len(closes) - count, 0), len(closes)):
+        if i < period - 1:
+            mid = sum(closes[:i+1]) / (i + 1)
+            std = np.std(closes[:i+1]) if i > 0 else 0
+        else:
+            mid = sum(closes[i-period+1:i+1]) / period
+            std = np.std(closes[i-period+1:i+1])
+        upper.append(mid + std_dev * std)
+        middle.append(mid)
+        lower.append(mid - std_dev * std)
+    return upper, middle, lower
+
+
 def vwap(candles):
     """Volume-Weighted Average Price from candle list."""
     cum_vol = 0
@@ -187,6 +224,11 @@ def vwap(candles):
     return result
 
 
+def vwap_series(highs, lows, closes, volumes):
+    """VWAP from parallel OHLCV columns (zero volume counts as 1)."""
+    return kernels.vwap(_as_array(highs), _as_array(lows), _as_array(closes), _as_array(volumes))
+
+
 def donchian(highs, lows, period):
     """
     Donchian Channel.
@@ -220,6 +262,15 @@ def volume_sma(volumes, period=20):
     return sma(volumes, period)
 
 
+def volume_sma_last(volumes, period=20):
+    """
+    Last value of volume_sma() — O(period): only the trailing window is
+    summed, not the whole session rebuilt on every scan.
+    """
+    window = volumes[-period:]
+    return sum(window) / len(window)
+
+
 def slope(series, lookback=3):
     """Linear slope over last N values."""
     if len(series) < lookback:
@@ -248,3 +299,66 @@ def opening_range(candles, market_open_hour=9, market_open_min=15, or_minutes=30
     or_high = max(float(c['high']) for c in or_candles)
     or_low = min(float(c['low']) for c in or_candles)
     return or_high, or_low
+
+
+def opening_range_arrays(minutes, highs, lows, market_open_hour=9, market_open_min=15, or_minutes=30):
+    """
+    opening_range() over buffer columns (minute-of-day + highs/lows).
+    Returns (or_high, or_low) or (None, None).
+    """
+    start = market_open_hour * 60 + market_open_min
+    or_high, or_low = kernels.opening_range(
+        np.ascontiguousarray(minutes, dtype=np.int16), _as_array(highs), _as_array(lows),
+        start, start + or_minutes,
+    )
+    if np.isnan(or_high):
+        return None, None
+    return or_high, or_low
+
+
+def last_values(highs, lows, closes, rsi_period=14, atr_period=14, ema_period=20, adx_period=14):
+    """
+    Last-bar RSI / ATR / EMA / ADX in one compiled pass (kernels.fold_running)
+    instead of a Python loop per indicator. Same values as rsi()[-1],
+    atr()[-1], ema()[-1] and adx()[0][-1], warm-up bars included.
+    """
+    h, l, c = _as_array(highs), _as_array(lows), _as_array(closes)
+    n = c.shape[0]
+    state = np.zeros(kernels.STATE_SIZE)
+    state[kernels.ST_HIGH] = -np.inf
+    state[kernels.ST_LOW] = np.inf
+    kernels.fold_running(h, l, c, np.zeros(n), 0, n, rsi_period, atr_period, ema_period, adx_period, state)
+
+    if n < rsi_period + 1:
+        rsi_val = 50.0
+    else:
+        avg_gain, avg_loss = state[kernels.ST_AVG_GAIN], state[kernels.ST_AVG_LOSS]
+        rsi_val = 100.0 if avg_loss == 0 else 100 - (100 / (1 + avg_gain / avg_loss))
+    if n < 2:
+        atr_val = 0.0
+    elif n < atr_period:
+        atr_val = h[0] - l[0]
+    else:
+        atr_val = state[kernels.ST_ATR]
+    ema_val = c[0] if n < ema_period else state[kernels.ST_EMA]
+    adx_val = 0.0 if n < 2 * adx_period else state[kernels.ST_ADX]
+    return LastValues(rsi=rsi_val, atr=atr_val, ema=ema_val, adx=adx_val)
+
+
+def compute_snapshot(highs, lows, closes, volumes, rsi_val=None, atr_val=None, adx_val=None):
+    """
+    One pass of ATR / RSI / ADX / VWAP for the latest bar.
+    rsi_val, atr_val, adx_val: RSI(14) / ATR(14) / ADX(14) already maintained
+    by the caller (e.g. CandleBuffer.rsi / .atr / .adx).
+    """
+    if rsi_val is None or atr_val is None or adx_val is None:
+        last = last_values(highs, lows, closes)
+        rsi_val = last.rsi if rsi_val is None else rsi_val
+        atr_val = last.atr if atr_val is None else atr_val
+        adx_val = last.adx if adx_val is None else adx_val
+    return IndicatorSnapshot(
+        atr=atr_val,
+        rsi=rsi_val,
+        adx=adx_val,
+        vwap=vwap_series(highs, lows, closes, volumes),
+    )
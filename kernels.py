@@ -0,0 +1,289 @@
+"""
+KiteAlerts V6.0 — Numeric Kernels
+Hot-path predicates and loops, compiled with Numba when available.
+Without numba (local runs only; deploys require it) they run as plain Python.
+"""
+
+import sys
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_ENABLED = True
+except ImportError:  # pragma: no cover - numba not installed
+    NUMBA_ENABLED = False
+
+    def njit(*args, **kwargs):
+        """Pass-through stand-in for numba.njit."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+
+# Explicit signatures compile at import ("declaration time"), not on
+# first call. Array kernels take C-contiguous float64 columns.
+
+@njit("int64(float64, float64, float64, float64)", cache=True, fastmath=True)
+def impulse_direction(open_, close, atr, atr_multiplier):
+    """
+    Momentum impulse predicate: candle body > atr_multiplier × ATR.
+    Returns a config.Direction value (1 green, -1 red) or 0 (no impulse).
+    """
+    if atr <= 0.0 or abs(close - open_) <= atr_multiplier * atr:
+        return 0
+    if close > open_:
+        return 1
+    if close < open_:
+        return -1
+    return 0
+
+
+@njit("float64[::1](float64[::1], float64[::1], float64[::1], float64[::1])",
+      cache=True, boundscheck=False)
+def vwap(highs, lows, closes, volumes):
+    """
+    Cumulative VWAP series. Zero volume counts as 1 so indices
+    (no volume feed) degrade to a typical-price average.
+    """
+    n = closes.shape[0]
+    out = np.empty(n)
+    cum_vol = 0.0
+    cum_pv = 0.0
+    for i in range(n):
+        typical = (highs[i] + lows[i] + closes[i]) / 3
+        vol = volumes[i] if volumes[i] != 0.0 else 1.0
+        cum_vol += vol
+        cum_pv += typical * vol
+        out[i] = cum_pv / cum_vol if cum_vol > 0 else typical
+    return out
+
+
+@njit("UniTuple(float64, 2)(int16[::1], float64[::1], float64[::1], int64, int64)",
+      cache=True, boundscheck=False)
+def opening_range(minutes, highs, lows, start_minute, end_minute):
+    """
+    High/low of bars whose minute-of-day is in [start_minute, end_minute),
+    filter and extremes fused in one pass. (nan, nan) if no bar qualifies.
+    """
+    hi = -np.inf
+    lo = np.inf
+    found = False
+    for i in range(minutes.shape[0]):
+        m = minutes[i]
+        if start_minute <= m < end_minute:
+            found = True
+            if highs[i] > hi:
+                hi = highs[i]
+            if lows[i] < lo:
+                lo = lows[i]
+    if not found:
+        return np.nan, np.nan
+    return hi, lo
+
+
+@njit("boolean(float64[::1], float64[::1], int64)", cache=True, boundscheck=False)
+def squeeze(highs, lows, lookback):
+    """
+    MODE_DON squeeze gate over the `lookback` bars before the last one:
+    any inside bar, or any range no wider than the bar before it (that bar
+    also in the window). One sweep, both predicates, first hit returns.
+    Too little data passes.
+    """
+    n = highs.shape[0]
+    if n < lookback + 2 or lookback < 2:
+        return True
+    first = n - lookback - 1
+    for i in range(first, n - 1):
+        if highs[i] <= highs[i - 1] and lows[i] >= lows[i - 1]:
+            return True
+        if i > first and highs[i] - lows[i] <= highs[i - 1] - lows[i - 1]:
+            return True
+    return False
+
+
+@njit("UniTuple(float64, 3)(float64[::1], float64[::1], float64[::1], float64[::1], int64)",
+      cache=True, boundscheck=False)
+def volume_profile(highs, lows, closes, volumes, num_bins):
+    """
+    (POC, VAH, VAL) of a typical-price volume histogram with a 70% value
+    area grown from the POC. Range and volume check share one pass; binning,
+    total and POC share the next. (nan, nan, nan) with no volume or no range.
+    Zero volume counts as 1.
+    """
+    n = closes.shape[0]
+    range_high = -np.inf
+    range_low = np.inf
+    has_volume = False
+    for i in range(n):
+        if highs[i] > range_high:
+            range_high = highs[i]
+        if lows[i] < range_low:
+            range_low = lows[i]
+        if volumes[i] > 0:
+            has_volume = True
+    range_size = range_high - range_low
+    if not has_volume or not range_size > 0:
+        return np.nan, np.nan, np.nan
+
+    bin_size = range_size / num_bins
+    bins = np.zeros(num_bins)
+    for i in range(n):
+        typical = (highs[i] + lows[i] + closes[i]) / 3
+        vol = volumes[i] if volumes[i] != 0.0 else 1.0
+        bins[min(int((typical - range_low) / bin_size), num_bins - 1)] += vol
+
+    poc_idx = 0
+    total_vol = 0.0
+    for b in range(num_bins):
+        total_vol += bins[b]
+        if bins[b] > bins[poc_idx]:
+            poc_idx = b
+    poc = range_low + (poc_idx + 0.5) * bin_size
+
+    # Value Area = 70% of total volume, expanding from POC toward the heavier side
+    target_vol = total_vol * 0.7
+    va_vol = bins[poc_idx]
+    lo = poc_idx
+    hi = poc_idx
+    while va_vol < target_vol and (lo > 0 or hi < num_bins - 1):
+        expand_up = bins[hi + 1] if hi < num_bins - 1 else 0.0
+        expand_down = bins[lo - 1] if lo > 0 else 0.0
+        if expand_up >= expand_down and hi < num_bins - 1:
+            hi += 1
+            va_vol += expand_up
+        elif lo > 0:
+            lo -= 1
+            va_vol += expand_down
+        else:
+            break
+
+    return poc, range_low + (hi + 1) * bin_size, range_low + lo * bin_size
+
+
+# fold_running state layout (see CandleBuffer)
+(ST_HIGH, ST_LOW, ST_AVG_GAIN, ST_AVG_LOSS, ST_ATR, ST_EMA,
+ ST_SM_TR, ST_SM_PLUS, ST_SM_MINUS, ST_ADX, ST_CUM_VOL, ST_CUM_PV) = range(12)
+STATE_SIZE = 12
+
+
+@njit("void(float64[::1], float64[::1], float64[::1], float64[::1], "
+      "int64, int64, int64, int64, int64, int64, float64[::1])",
+      cache=True, boundscheck=False)
+def fold_running(highs, lows, closes, volumes, start, stop,
+                 rsi_period, atr_period, ema_period, adx_period, state):
+    """
+    Advance running indicator state over bars [start, stop) in one pass:
+    session extremes, VWAP sums, Wilder ATR / RSI / ADX and EMA together.
+    `state` (ST_* layout) is updated in place; Wilder averages hold plain
+    sums until their first full period.
+    """
+    ek = 2.0 / (ema_period + 1)
+    for k in range(start, stop):
+        h = highs[k]
+        l = lows[k]
+        if h > state[ST_HIGH]:
+            state[ST_HIGH] = h
+        if l < state[ST_LOW]:
+            state[ST_LOW] = l
+
+        # VWAP sums, accumulated exactly as vwap() does
+        typical = (h + l + closes[k]) / 3
+        vol = volumes[k] if volumes[k] != 0.0 else 1.0
+        state[ST_CUM_VOL] += vol
+        state[ST_CUM_PV] += typical * vol
+
+        if k == 0:
+            tr = h - l
+        else:
+            pc = closes[k - 1]
+            tr = max(h - l, abs(h - pc), abs(l - pc))
+
+        # ATR
+        p = atr_period
+        if k < p - 1:
+            state[ST_ATR] += tr
+        elif k == p - 1:
+            state[ST_ATR] = (state[ST_ATR] + tr) / p
+        else:
+            state[ST_ATR] = (state[ST_ATR] * (p - 1) + tr) / p
+
+        # EMA seeded with the first close
+        if k == 0:
+            state[ST_EMA] = closes[0]
+            continue
+        state[ST_EMA] = closes[k] * ek + state[ST_EMA] * (1 - ek)
+
+        # RSI
+        p = rsi_period
+        d = closes[k] - closes[k - 1]
+        gain = d if d > 0 else 0.0
+        loss = -d if d < 0 else 0.0
+        if k < p:
+            state[ST_AVG_GAIN] += gain
+            state[ST_AVG_LOSS] += loss
+        elif k == p:
+            state[ST_AVG_GAIN] = (state[ST_AVG_GAIN] + gain) / p
+            state[ST_AVG_LOSS] = (state[ST_AVG_LOSS] + loss) / p
+        else:
+            state[ST_AVG_GAIN] = (state[ST_AVG_GAIN] * (p - 1) + gain) / p
+            state[ST_AVG_LOSS] = (state[ST_AVG_LOSS] * (p - 1) + loss) / p
+
+        # ADX: smoothed TR / +DM / -DM (sums for the first p moves), then DX
+        p = adx_period
+        up = h - highs[k - 1]
+        down = lows[k - 1] - l
+        plus_dm = up if up > down and up > 0 else 0.0
+        minus_dm = down if down > up and down > 0 else 0.0
+        j = k - 1
+        if j < p:
+            state[ST_SM_TR] += tr
+            state[ST_SM_PLUS] += plus_dm
+            state[ST_SM_MINUS] += minus_dm
+            if j < p - 1:
+                continue
+        else:
+            state[ST_SM_TR] = state[ST_SM_TR] - state[ST_SM_TR] / p + tr
+            state[ST_SM_PLUS] = state[ST_SM_PLUS] - state[ST_SM_PLUS] / p + plus_dm
+            state[ST_SM_MINUS] = state[ST_SM_MINUS] - state[ST_SM_MINUS] / p + minus_dm
+
+        sm_tr = state[ST_SM_TR]
+        pdi = (state[ST_SM_PLUS] / sm_tr * 100) if sm_tr > 0 else 0.0
+        mdi = (state[ST_SM_MINUS] / sm_tr * 100) if sm_tr > 0 else 0.0
+        di_sum = pdi + mdi
+        dx = (abs(pdi - mdi) / di_sum * 100) if di_sum > 0 else 0.0
+
+        # ADX: mean of the first p DX values, then Wilder
+        t = j - p + 1
+        if t < p - 1:
+            state[ST_ADX] += dx
+        elif t == p - 1:
+            state[ST_ADX] = (state[ST_ADX] + dx) / p
+        else:
+            state[ST_ADX] = (state[ST_ADX] * (p - 1) + dx) / p
+
+
+def warmup():
+    """
+    Compile (or load from Numba's on-disk cache) every kernel once,
+    so JIT latency lands at engine start instead of on a live scan.
+    """
+    impulse_direction(100.0, 101.0, 1.0, 1.5)
+    col = np.ones(4)
+    vwap(col, col, col, col)
+    opening_range(np.arange(4, dtype=np.int16), col, col, 0, 2)
+    squeeze(col, col, 2)
+    volume_profile(col, col, col, col, 2)
+    fold_running(col, col, col, col, 0, 4, 2, 2, 2, 2, np.zeros(STATE_SIZE))
+
+
+if __name__ == "__main__":
+    # Build step: `python kernels.py` fills Numba's on-disk cache next to
+    # this file (signatures compile at import), so a fresh deploy loads
+    # machine code instead of compiling on its first start. numba is in
+    # requirements.txt, so a build without it is broken: fail it rather
+    # than deploy the plain-Python fallback.
+    if not NUMBA_ENABLED:
+        sys.exit("numba not installed: kernels would run as plain Python")
+    warmup()
+    print("Kernels compiled")
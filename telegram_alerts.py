@@ -4,7 +4,11 @@ Dual-Profiler payload format: Math + AI context in every signal.
 """
 
 import os
+import time
+import queue
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 import logging
 from dotenv import load_dotenv
 
@@ -13,26 +17,128 @@ load_dotenv()
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID", "")
 
+# Sends never block the engine: messages go on a queue drained by one
+# daemon thread over a keep-alive session.
+KEEPALIVE_SECONDS = 240     # Idle ping so the next alert skips the TLS handshake
+OUTBOX_SIZE = 100           # Backlog cap while Telegram is unreachable
+COALESCE_SECONDS = 0.5      # Identical messages queued this close together go out once
+
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1))   # One sender thread
+_outbox = queue.Queue(maxsize=OUTBOX_SIZE)
+_worker = None
+_worker_lock = threading.Lock()
+
 
 def send_message(text):
-    """Send raw HTML message to Telegram."""
+    """
+    Queue a raw HTML message for Telegram. Returns at once.
+
+    Returns:
+        bool: True if accepted for delivery (queued, not yet sent), False
+        if the bot is not configured or the backlog is full. Delivery
+        failures are logged by the sender thread; call flush() before
+        exit so queued messages are not lost with the process.
+    """
     if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHAT_ID:
         logging.warning("[TELEGRAM] Bot token or chat ID not configured")
         return False
 
+    _ensure_worker()
+    try:
+        _outbox.put_nowait(text)
+    except queue.Full:
+        first_line = text.split("\n", 1)[0]
+        logging.error("[TELEGRAM] Outbox full (%d), message dropped: %s", OUTBOX_SIZE, first_line)
+        return False
+    return True
+
+
+def flush(timeout=10):
+    """Wait until everything queued so far is sent. Returns False on timeout."""
+    if _worker is None:
+        return True
+    done = threading.Event()
+    try:
+        _outbox.put(done, timeout=timeout)
+    except queue.Full:
+        return False
+    return done.wait(timeout)
+
+
+def _ensure_worker():
+    global _worker
+    if _worker is not None:
+        return
+    with _worker_lock:
+        if _worker is None:
+            _worker = threading.Thread(target=_drain_outbox, daemon=True, name="TelegramSender")
+            _worker.start()
+
+
+def _drain_outbox():
+    while True:
+        try:
+            item = _outbox.get(timeout=KEEPALIVE_SECONDS)
+        except queue.Empty:
+            _ping()
+            continue
+        if isinstance(item, threading.Event):   # flush() marker
+            item.set()
+            continue
+        batch, marker = _collect(item)
+        for text, count in batch.items():
+            _post(text if count == 1 else f"{text}\n\n<i>(×{count})</i>")
+        if marker:
+            marker.set()
+
+
+def _collect(first):
+    """
+    Gather messages queued within COALESCE_SECONDS of `first` as
+    {text: count}, in arrival order. Stops early at a flush() marker,
+    returned so it is set after the batch is sent.
+    """
+    batch = {first: 1}
+    deadline = time.monotonic() + COALESCE_SECONDS
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return batch, None
+        try:
+            item = _outbox.get(timeout=remaining)
+        except queue.Empty:
+            return batch, None
+        if isinstance(item, threading.Event):
+            return batch, item
+        batch[item] = batch.get(item, 0) + 1
+
+
+def _post(text):
+    """POST one message. Never raises."""
     try:
         url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-        resp = requests.post(url, data={
+        resp = _session.post(url, data={
             "chat_id": TELEGRAM_CHAT_ID,
             "text": text,
             "parse_mode": "HTML",
         }, timeout=10)
+        if resp.status_code != 200:
+            logging.error("[TELEGRAM] Send failed: HTTP %s", resp.status_code)
         return resp.status_code == 200
     except Exception as e:
-        logging.error(f"[TELEGRAM] Send failed: {e}")
+        logging.error("[TELEGRAM] Send failed: %s", e)
         return False
 
 
+def _ping():
+    """Cheap authenticated GET that keeps the pooled connection open."""
+    try:
+        _session.get(f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/getMe", timeout=5)
+    except Exception as e:
+        logging.debug("[TELEGRAM] Keep-alive ping failed: %s", e)   # Lazy: DEBUG is filtered out
+
+
 def send_signal_alert(instrument, engine, direction, entry, sl, target,
                       math_profile, ai_profile, extra_info=None):
     """
@@ -48,16 +154,15 @@ def send_signal_alert(instrument, engine, direction, entry, sl, target,
         math_profile: dict {"tag": "...", "reasons": ["...", "..."]}
         ai_profile: dict {"tag": "...", "bullets": ["...", "...", "..."]}
         extra_info: optional str (e.g. "⚠️ EXPIRY WARNING")
+
+    Returns:
+        bool: True once queued, see send_message()
     """
     # Math section
-    math_reasons = ""
-    for r in math_profile.get("reasons", [])[:2]:
-        math_reasons += f"• {r}\n"
+    math_reasons = "".join(f"• {r}\n" for r in math_profile.get("reasons", [])[:2])
 
     # AI section
-    ai_bullets = ""
-    for b in ai_profile.get("bullets", [])[:3]:
-        ai_bullets += f"• {b}\n"
+    ai_bullets = "".join(f"• {b}\n" for b in ai_profile.get("bullets", [])[:3])
 
     # Extra warning line
     extra_line = f"\n{extra_info}" if extra_info else ""
@@ -86,7 +191,7 @@ def send_signal_alert(instrument, engine, direction, entry, sl, target,
 
 
 def send_exit_alert(instrument, engine, direction, entry, exit_price, pnl_r):
-    """Trade exit notification."""
+    """Trade exit notification. True once queued, see send_message()."""
     emoji = "✅" if pnl_r > 0 else "❌"
     exit_type = "PROFIT" if pnl_r > 0 else "STOP HIT" if pnl_r < 0 else "BREAKEVEN"
 
@@ -100,6 +205,6 @@ def send_exit_alert(instrument, engine, direction, entry, exit_price, pnl_r):
 
 
 def send_system_alert(title, body):
-    """Generic system alert (startup, shutdown, errors)."""
+    """Generic system alert (startup, shutdown, errors). True once queued, see send_message()."""
     msg = f"📢 <b>{title}</b>\n\n{body}"
     return send_message(msg)
@@ -0,0 +1,38 @@
+"""
+KiteAlerts V6.0 — Test fixtures
+Modules live at the repo root; make them importable from tests/.
+"""
+
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _candles(seed, n, volume=True, start=datetime(2026, 10, 15, 9, 15)):
+    """Random-walk 5-min candles shaped like a Kite historical_data response."""
+    rnd = random.Random(seed)
+    price = 24000.0
+    out = []
+    for i in range(n):
+        o = price
+        c = o + rnd.gauss(0, 12) + (40 if rnd.random() < 0.03 else 0) * rnd.choice((-1, 1))
+        out.append({
+            "date": start + timedelta(minutes=5 * i),
+            "open": round(o, 2),
+            "high": round(max(o, c) + abs(rnd.gauss(0, 6)), 2),
+            "low": round(min(o, c) - abs(rnd.gauss(0, 6)), 2),
+            "close": round(c, 2),
+            "volume": rnd.randint(1000, 9000) * (3 if rnd.random() < 0.1 else 1) if volume else 0,
+        })
+        price = c
+    return out
+
+
+@pytest.fixture
+def make_candles():
+    return _candles
@@ -0,0 +1,212 @@
+"""
+CandleBuffer against the list indicators it replaced: the O(1) running
+state (kernels.fold_running) must give the same values as indicators.*
+over the stored window, through ingest, merge, eviction and live ticks.
+"""
+
+import copy
+
+import pytest
+
+import indicators as ind
+from candle_buffer import CandleBuffer, BULK_INGEST_MIN
+
+# (rsi, atr, ema, adx) periods: defaults, plus short ones that cross every warm-up branch
+PERIODS = [(14, 14, 20, 14), (2, 3, 2, 2), (3, 2, 5, 3)]
+
+
+def _buffer(periods=PERIODS[0], capacity=256):
+    rsi_p, atr_p, ema_p, adx_p = periods
+    return CandleBuffer(capacity=capacity, rsi_period=rsi_p, atr_period=atr_p,
+                        ema_period=ema_p, adx_period=adx_p)
+
+
+def _assert_columns(buf, candles):
+    assert buf.n == len(candles)
+    assert buf.dates == [c["date"] for c in candles]
+    for name in ("open", "high", "low", "close"):
+        assert getattr(buf, name + "s").tolist() == [float(c[name]) for c in candles]
+    assert buf.volumes.tolist() == [float(c.get("volume", 0) or 0) for c in candles]
+    assert buf.minutes.tolist() == [c["date"].hour * 60 + c["date"].minute for c in candles]
+
+
+def _assert_indicators(buf):
+    """Every O(1) read equals a full list recompute over the buffer's own bars."""
+    hs, ls, cs = buf.highs.tolist(), buf.lows.tolist(), buf.closes.tolist()
+    bars = [{"high": h, "low": l, "close": c, "volume": v}
+            for h, l, c, v in zip(hs, ls, cs, buf.volumes.tolist())]
+    assert buf.rsi == ind.rsi(cs, buf.rsi_period)[-1]
+    assert buf.atr == ind.atr(hs, ls, cs, buf.atr_period)[-1]
+    assert buf.ema == ind.ema(cs, buf.ema_period)[-1]
+    assert buf.adx == ind.adx(hs, ls, cs, buf.adx_period)[0][-1]
+    assert buf.vwap == ind.vwap(bars)[-1]
+    assert buf.session_high == max(hs)
+    assert buf.session_low == min(ls)
+
+
+def _widen(candle, step):
+    bar = dict(candle)
+    bar["high"] += step
+    bar["low"] -= step
+    bar["close"] = bar["low"] + (bar["high"] - bar["low"]) * (0.25 + 0.25 * step)
+    return bar
+
+
+def _forming(candles, k, step):
+    """
+    Session response up to bar k, the last bar still forming: its range
+    widens with `step`, and closed bars hold their final (step 2) shape.
+    """
+    return [_widen(c, 2) for c in candles[:k - 1]] + [_widen(candles[k - 1], step)]
+
+
+@pytest.mark.parametrize("periods", PERIODS)
+def test_session_responses_with_forming_bar(make_candles, periods):
+    candles = make_candles(3, 120)
+    buf = _buffer(periods)
+    for k in range(1, len(candles) + 1):
+        for step in (1, 2):
+            resp = _forming(candles, k, step)
+            buf.ingest(resp)
+            _assert_columns(buf, resp)
+            _assert_indicators(buf)
+
+
+def test_incremental_responses_from_last_bar(make_candles):
+    candles = make_candles(5, 100)
+    buf = _buffer()
+    buf.ingest(candles[:10])
+    for k in range(10, len(candles)):
+        assert buf.ingest(candles[k - 1:k + 1]) == 2
+        _assert_indicators(buf)
+    _assert_columns(buf, candles)
+
+
+def test_bulk_ingest_matches_per_bar(make_candles):
+    candles = make_candles(6, 2 * BULK_INGEST_MIN)
+    bulk = _buffer()
+    bulk.ingest(candles)
+    stepped = _buffer()
+    for k in range(1, len(candles) + 1):
+        stepped.ingest(candles[k - 1:k])
+    _assert_columns(bulk, candles)
+    _assert_columns(stepped, candles)
+    for name in ("rsi", "atr", "ema", "adx", "vwap"):
+        assert getattr(bulk, name) == getattr(stepped, name)
+
+
+@pytest.mark.parametrize("periods", PERIODS)
+def test_eviction_keeps_last_capacity_bars(make_candles, periods):
+    capacity = 40
+    candles = make_candles(7, 5 * capacity)     # Several compactions of the 2× store
+    buf = _buffer(periods, capacity=capacity)
+    for k in range(1, len(candles) + 1):
+        resp = _forming(candles, k, 1 + k % 2)
+        buf.ingest(resp)
+        _assert_columns(buf, resp[-capacity:])
+        _assert_indicators(buf)
+
+
+def test_oversized_response_keeps_newest_bars(make_candles):
+    candles = make_candles(8, 100)
+    buf = _buffer(capacity=40)
+    buf.ingest(candles)
+    _assert_columns(buf, candles[-40:])
+    _assert_indicators(buf)
+
+
+def test_rebuild_when_stored_last_bar_is_missing(make_candles):
+    buf = _buffer()
+    buf.ingest(make_candles(9, 60))
+    other_day = make_candles(10, 40)    # Same timestamps up to bar 40, none match bar 60
+    buf.ingest(other_day)
+    _assert_columns(buf, other_day)
+    _assert_indicators(buf)
+
+
+def test_no_volume_feed(make_candles):
+    candles = make_candles(11, 80, volume=False)
+    buf = _buffer()
+    for k in range(1, len(candles) + 1):
+        buf.ingest(candles[:k])
+        _assert_indicators(buf)
+    assert not buf.volumes.any()
+
+
+def test_update_last_moves_forming_bar(make_candles):
+    candles = make_candles(12, 80)
+    buf = _buffer()
+    buf.ingest(candles)
+    assert not buf.update_last(candles[-1]["close"])    # Unchanged close: nothing to do
+
+    last = candles[-1]
+    for price in (last["high"] + 15, last["low"] - 15, last["close"] + 1):
+        _assert_indicators(buf)                         # Fills the tip cache first
+        assert buf.update_last(price)
+        assert buf.closes[-1] == price
+        _assert_indicators(buf)                         # Cache followed the tick
+    assert buf.highs[-1] == last["high"] + 15
+    assert buf.lows[-1] == last["low"] - 15
+    assert buf.highs[:-1].tolist() == [c["high"] for c in candles[:-1]]
+
+
+def test_update_last_on_empty_buffer():
+    assert not CandleBuffer().update_last(100.0)
+
+
+def test_rewrite_keeps_tick_extremes(make_candles):
+    candles = make_candles(13, 60)
+    buf = _buffer()
+    buf.ingest(candles)
+    last = candles[-1]
+    buf.update_last(last["high"] + 20)
+    buf.update_last(last["low"] - 20)
+
+    buf.ingest(copy.deepcopy(candles[-1:]))     # Kite's candle lags the ticks
+    assert buf.highs[-1] == last["high"] + 20
+    assert buf.lows[-1] == last["low"] - 20
+    assert buf.closes[-1] == last["close"]      # Close is always Kite's
+    _assert_indicators(buf)
+
+
+def test_rewrite_keeps_wider_range_and_takes_wider_candle(make_candles):
+    candles = make_candles(14, 60)
+    buf = _buffer()
+    buf.ingest(candles)
+    last = candles[-1]
+
+    narrower = copy.deepcopy(candles[-1:])
+    narrower[0]["high"] -= 1
+    narrower[0]["low"] += 1
+    buf.ingest(narrower)
+    assert (buf.highs[-1], buf.lows[-1]) == (last["high"], last["low"])
+
+    wider = copy.deepcopy(candles[-1:])
+    wider[0]["high"] += 5
+    wider[0]["low"] -= 5
+    buf.ingest(wider)
+    assert (buf.highs[-1], buf.lows[-1]) == (last["high"] + 5, last["low"] - 5)
+    _assert_indicators(buf)
+
+
+def test_new_bar_does_not_inherit_previous_extremes(make_candles):
+    candles = make_candles(15, 60)
+    buf = _buffer()
+    buf.ingest(candles[:-1])
+    buf.update_last(candles[-2]["high"] + 50)
+    buf.ingest(candles[-2:])
+    assert buf.highs[-2] == candles[-2]["high"] + 50
+    assert buf.highs[-1] == candles[-1]["high"]
+    _assert_indicators(buf)
+
+
+def test_clear(make_candles):
+    buf = _buffer()
+    buf.ingest(make_candles(16, 50))
+    buf.clear()
+    assert buf.n == 0 and buf.last_date is None
+    assert buf.session_high is None and buf.vwap is None
+    candles = make_candles(17, 30)
+    buf.ingest(candles)
+    _assert_columns(buf, candles)
+    _assert_indicators(buf)
@@ -0,0 +1,171 @@
+"""
+Runner scheduling: refresh timing around bar closes, the idle wait to
+the next gate, and the candle-fetch backoff on rate limits.
+"""
+
+import threading
+import time
+from datetime import datetime
+
+import pytest
+from kiteconnect.exceptions import NetworkException
+
+import config
+import engine_runner
+import telegram_alerts
+from engine_runner import TriCoreRunner, seconds_of_day, seconds_to_refresh
+
+
+def _at(hour, minute, second=0, microsecond=0):
+    # A Thursday: no CRUDEOIL inventory blackout
+    return engine_runner.IST.localize(datetime(2026, 10, 15, hour, minute, second, microsecond))
+
+
+# ── seconds_to_refresh ──────────────────────────────────────────
+
+@pytest.mark.parametrize("now, expected", [
+    (_at(9, 47), 30),                       # Mid-bar: the plain scan interval
+    (_at(9, 49, 50), 12),                   # Pulled in to the settle point after 09:50
+    (_at(9, 49, 59, 500000), 2.5),
+    (_at(9, 50), 2),                        # Bar just closed: wait for Kite to settle it
+    (_at(9, 50, 2), 30),                    # Exactly at the settle point: not 0
+    (_at(9, 50, 3), 30),
+    (_at(9, 54, 45), 17),
+    (_at(23, 59, 59), 3),                   # Settle point falls after midnight
+])
+def test_seconds_to_refresh(now, expected):
+    assert seconds_to_refresh(now) == pytest.approx(expected)
+
+
+# ── _seconds_to_next_gate ───────────────────────────────────────
+
+@pytest.fixture
+def runner():
+    return TriCoreRunner()
+
+
+@pytest.mark.parametrize("now, expected", [
+    (_at(8, 0), 3600),                      # Before any window: CRUDEOIL opens 09:00
+    (_at(9, 0), 2700),                      # On a start: that gate is open, next is 09:45
+    (_at(9, 44, 59), 1),
+    (_at(12, 0), 11700.001),                # Mid-window: the index windows close
+    (_at(15, 15), 0.001),                   # Inclusive end: wake just after it
+    (_at(15, 15, 0, 500000), 16199.5),      # Past it: the blackout start at 19:45
+    (_at(20, 45), 0.001),
+    (_at(23, 30), 0.001),
+    (_at(23, 30, 0, 500000), 34199.5),      # After the last window: tomorrow's 09:00
+])
+def test_seconds_to_next_gate(runner, now, expected):
+    assert runner._seconds_to_next_gate(seconds_of_day(now)) == pytest.approx(expected)
+
+
+# ── Candle-fetch backoff ────────────────────────────────────────
+
+class _FakeKite:
+    """Resolves every configured symbol; candle fetches fail while `failing` says so."""
+
+    access_token = "test"
+
+    def __init__(self, failing):
+        self.failing = failing
+        self.fetches = 0
+
+    def instruments(self, exchange):
+        out = []
+        for i, cfg in enumerate(config.INSTRUMENTS.values()):
+            ex, symbol = cfg["kite_symbol"].split(":")
+            if ex == exchange:
+                out.append({"exchange": ex, "tradingsymbol": symbol, "instrument_token": i + 1})
+        return out
+
+    def historical_data(self, token, from_time, to_time, interval):
+        self.fetches += 1
+        if self.failing():
+            raise NetworkException("Too many requests", code=429)
+        return []
+
+
+class _StopAfter:
+    """Stop event that records each wait and stops the loop after `passes` of them."""
+
+    def __init__(self, passes):
+        self.passes = passes
+        self.waits = []
+
+    def is_set(self):
+        return len(self.waits) >= self.passes
+
+    def set(self):
+        self.passes = 0
+
+    def wait(self, timeout=None):
+        self.waits.append(timeout)
+        return self.is_set()
+
+
+@pytest.fixture
+def quiet(monkeypatch):
+    monkeypatch.setattr(telegram_alerts, "TELEGRAM_BOT_TOKEN", "")
+    monkeypatch.setattr(engine_runner, "now_ist", lambda: _at(10, 1))   # 30 s to the next refresh
+
+
+def test_polling_backs_off_while_fetches_fail(quiet, monkeypatch):
+    monkeypatch.setattr(config, "TICK_STREAM_ENABLED", False)
+    failing = [True] * 4 + [False] + [True] * 2      # Per pass; each pass ends in one wait
+    stop = _StopAfter(len(failing))
+    runner = TriCoreRunner(stop_event=stop)
+    kite = runner.kite = _FakeKite(lambda: failing[len(stop.waits)])
+    runner.run()
+
+    base = config.ERROR_BACKOFF_SECONDS
+    assert stop.waits == [30 + base, 30 + 2 * base, 30 + 4 * base, 30 + 8 * base,
+                          30, 30 + base, 30 + 2 * base]
+    assert kite.fetches == 4 * len(failing)
+
+
+def test_backoff_is_capped(quiet, monkeypatch):
+    monkeypatch.setattr(config, "TICK_STREAM_ENABLED", False)
+    stop = _StopAfter(12)
+    runner = TriCoreRunner(stop_event=stop)
+    runner.kite = _FakeKite(lambda: True)
+    runner.run()
+    assert max(stop.waits) == 30 + config.ERROR_BACKOFF_MAX_SECONDS
+    assert stop.waits[-1] == stop.waits[-2]
+
+
+class _FakeStream:
+    def __init__(self):
+        self.wake = threading.Event()
+
+    def drain(self):
+        self.wake.clear()
+        return {}
+
+
+def test_streaming_backs_off_next_fetch(quiet):
+    runner = TriCoreRunner()
+    failing = [True]
+    runner.kite = _FakeKite(lambda: failing[0])
+    runner._resolve_tokens()
+    due = list(runner.instruments.values())
+    stream = _FakeStream()
+    now = _at(10, 1)
+
+    def landed():
+        """One pass that submits the refresh, then passes until it lands."""
+        runner._next_fetch = 0.0
+        list(runner._stream_due(due, stream, now))
+        while runner._pending:
+            stream.wake.wait(5)
+            list(runner._stream_due(due, stream, now))
+        return runner._next_fetch - time.monotonic()
+
+    base = config.ERROR_BACKOFF_SECONDS
+    assert landed() == pytest.approx(30 + base, abs=1)
+    assert landed() == pytest.approx(30 + 2 * base, abs=1)
+    failing[0] = False
+    assert landed() == pytest.approx(30, abs=1)     # Success resets the backoff
+    assert runner._fetch_backoff == base
+    failing[0] = True
+    assert landed() == pytest.approx(30 + base, abs=1)
+    runner._fetch_pool.shutdown()
@@ -0,0 +1,187 @@
+"""
+Each kernel against the list implementation it replaced, both compiled
+and as plain Python (the dispatcher's .py_func, what runs without numba).
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+import indicators as ind
+import kernels
+
+
+def _both(kernel):
+    """Compiled dispatcher and its pure-Python body (same object without numba)."""
+    return pytest.mark.parametrize("fn", [kernel, getattr(kernel, "py_func", kernel)],
+                                   ids=["dispatch", "py_func"])
+
+
+def _columns(candles):
+    return tuple(np.array([float(c.get(k, 0) or 0) for c in candles])
+                 for k in ("open", "high", "low", "close", "volume"))
+
+
+# ── References: the list code the kernels replaced ──────────────
+
+def _impulse_ref(open_, close, atr, multiplier):
+    if atr > 0 and abs(close - open_) > multiplier * atr:
+        if close > open_:
+            return 1
+        if close < open_:
+            return -1
+    return 0
+
+
+def _squeeze_ref(candles, lookback):
+    """engine_mode_don._check_squeeze before kernels.squeeze."""
+    if len(candles) < lookback + 2:
+        return True
+    ranges = []
+    for i in range(len(candles) - lookback - 1, len(candles) - 1):
+        ranges.append(float(candles[i]['high']) - float(candles[i]['low']))
+    if len(ranges) < 2:
+        return True
+    contracting = sum(1 for i in range(1, len(ranges)) if ranges[i] <= ranges[i-1])
+    inside_bars = 0
+    for i in range(len(candles) - lookback - 1, len(candles) - 1):
+        if i > 0:
+            h = float(candles[i]['high'])
+            l = float(candles[i]['low'])
+            ph = float(candles[i-1]['high'])
+            pl = float(candles[i-1]['low'])
+            if h <= ph and l >= pl:
+                inside_bars += 1
+    return contracting >= 1 or inside_bars >= 1
+
+
+def _volume_profile_ref(candles, lookback):
+    """engine_vortex._compute_volume_profile before kernels.volume_profile."""
+    recent = candles[-lookback:]
+    volumes = [float(c.get('volume', 0) or 0) for c in recent]
+    if not any(v > 0 for v in volumes):
+        return None, None, None
+    range_high = max(float(c['high']) for c in recent)
+    range_low = min(float(c['low']) for c in recent)
+    range_size = range_high - range_low
+    if range_size <= 0:
+        return None, None, None
+
+    num_bins = 20
+    bin_size = range_size / num_bins
+    bins = [0.0] * num_bins
+    for c in recent:
+        typical = (float(c['high']) + float(c['low']) + float(c['close'])) / 3
+        vol = float(c.get('volume', 1) or 1)
+        bins[min(int((typical - range_low) / bin_size), num_bins - 1)] += vol
+
+    poc_idx = bins.index(max(bins))
+    poc = range_low + (poc_idx + 0.5) * bin_size
+    target_vol = sum(bins) * 0.7
+    va_vol = bins[poc_idx]
+    lo = hi = poc_idx
+    while va_vol < target_vol and (lo > 0 or hi < num_bins - 1):
+        expand_up = bins[hi + 1] if hi < num_bins - 1 else 0
+        expand_down = bins[lo - 1] if lo > 0 else 0
+        if expand_up >= expand_down and hi < num_bins - 1:
+            hi += 1
+            va_vol += expand_up
+        elif lo > 0:
+            lo -= 1
+            va_vol += expand_down
+        else:
+            break
+    return poc, range_low + (hi + 1) * bin_size, range_low + lo * bin_size
+
+
+# ── Series kernels ──────────────────────────────────────────────
+
+LENGTHS = [1, 2, 3, 13, 14, 15, 28, 29, 120]
+
+
+@_both(kernels.vwap)
+@pytest.mark.parametrize("volume", [True, False])
+def test_vwap(make_candles, fn, volume):
+    candles = make_candles(21, 120, volume=volume)
+    _, h, l, c, v = _columns(candles)
+    assert fn(h, l, c, v).tolist() == ind.vwap(candles)
+
+
+@_both(kernels.opening_range)
+def test_opening_range(make_candles, fn):
+    candles = make_candles(22, 40)
+    minutes = np.array([c["date"].hour * 60 + c["date"].minute for c in candles], dtype=np.int16)
+    _, h, l, _, _ = _columns(candles)
+    for start, length in ((555, 30), (555, 5), (560, 15), (900, 30)):
+        expected = ind.opening_range(candles, start // 60, start % 60, length)
+        hi, lo = fn(minutes, h, l, start, start + length)
+        assert ((None, None) if np.isnan(hi) else (hi, lo)) == expected
+
+
+def test_opening_range_arrays(make_candles):
+    candles = make_candles(23, 40)
+    minutes = [c["date"].hour * 60 + c["date"].minute for c in candles]
+    _, h, l, _, _ = _columns(candles)
+    assert ind.opening_range_arrays(minutes, h, l) == ind.opening_range(candles)
+    assert ind.opening_range_arrays(minutes[10:], h[10:], l[10:]) == (None, None)
+
+
+@pytest.mark.parametrize("periods", [(14, 14, 20, 14), (2, 3, 2, 2), (3, 2, 5, 3)])
+def test_last_values(make_candles, periods):
+    rsi_p, atr_p, ema_p, adx_p = periods
+    for n in LENGTHS:
+        _, h, l, c, _ = _columns(make_candles(n, n))
+        hs, ls, cs = h.tolist(), l.tolist(), c.tolist()
+        assert ind.last_values(h, l, c, rsi_p, atr_p, ema_p, adx_p) == (
+            ind.rsi(cs, rsi_p)[-1], ind.atr(hs, ls, cs, atr_p)[-1],
+            ind.ema(cs, ema_p)[-1], ind.adx(hs, ls, cs, adx_p)[0][-1],
+        )
+
+
+# ── Engine kernels ──────────────────────────────────────────────
+
+@_both(kernels.impulse_direction)
+def test_impulse_direction(fn):
+    rnd = random.Random(24)
+    cases = [(100.0, 100.0, 1.0, 1.5), (100.0, 103.0, 0.0, 1.5), (100.0, 101.5, 1.0, 1.5),
+             (100.0, 101.6, 1.0, 1.5), (100.0, 98.4, 1.0, 1.5), (100.0, 103.0, -1.0, 1.5)]
+    cases += [(100.0, 100.0 + rnd.gauss(0, 5), abs(rnd.gauss(2, 1)), 1.5) for _ in range(500)]
+    for case in cases:
+        assert fn(*case) == _impulse_ref(*case)
+
+
+@_both(kernels.squeeze)
+@pytest.mark.parametrize("lookback", [1, 2, 3, 5])
+def test_squeeze(make_candles, fn, lookback):
+    for seed in range(60):
+        candles = make_candles(seed, 3 + seed % 8)
+        _, h, l, _, _ = _columns(candles)
+        assert fn(h, l, lookback) == _squeeze_ref(candles, lookback)
+
+
+@_both(kernels.squeeze)
+def test_squeeze_expanding_ranges(fn):
+    # Every bar wider than, and not inside, the one before: no squeeze
+    highs = np.array([101.0, 102.0, 103.5, 105.5, 108.0])
+    lows = np.array([99.0, 98.5, 97.5, 96.0, 94.0])
+    candles = [{"high": h, "low": l} for h, l in zip(highs, lows)]
+    assert fn(highs, lows, 3) is False
+    assert _squeeze_ref(candles, 3) is False
+
+
+@_both(kernels.volume_profile)
+@pytest.mark.parametrize("lookback", [1, 5, 30])
+def test_volume_profile(make_candles, fn, lookback):
+    for seed in range(20):
+        candles = make_candles(seed, 40)
+        _, h, l, c, v = _columns(candles[-lookback:])
+        result = fn(h, l, c, v, 20)
+        got = (None, None, None) if np.isnan(result[0]) else result
+        assert got == _volume_profile_ref(candles, lookback)
+
+
+@_both(kernels.volume_profile)
+def test_volume_profile_without_volume(make_candles, fn):
+    _, h, l, c, v = _columns(make_candles(25, 30, volume=False))
+    assert all(np.isnan(x) for x in fn(h, l, c, v, 20))
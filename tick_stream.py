@@ -0,0 +1,64 @@
+"""
+KiteAlerts V6.0 — Live Tick Stream
+KiteTicker websocket in LTP mode. The ticker thread only records the
+latest price per token and wakes the engine loop; candle buffers are
+touched on the loop's own thread.
+"""
+
+import logging
+import threading
+from kiteconnect import KiteTicker
+
+
+class LtpStream:
+    """Latest traded price per instrument token, pushed by Kite."""
+
+    def __init__(self, api_key, access_token, tokens):
+        self.tokens = list(tokens)
+        self.wake = threading.Event()   # Set on every tick batch
+        self._latest = {}
+        self._lock = threading.Lock()
+
+        self._ticker = KiteTicker(api_key, access_token)
+        self._ticker.on_connect = self._on_connect
+        self._ticker.on_ticks = self._on_ticks
+        self._ticker.on_close = self._on_close
+        self._ticker.on_error = self._on_error
+
+    def start(self):
+        """Connect on Kite's websocket thread (auto-reconnects)."""
+        self._ticker.connect(threaded=True)
+
+    def close(self):
+        """Drop the connection. The reactor keeps running for a replacement stream."""
+        try:
+            self._ticker.close()
+        except Exception as e:
+            logging.warning("Tick stream close error: %s", e)
+
+    def drain(self):
+        """Return {token: last_price} received since the previous drain."""
+        self.wake.clear()   # Before the swap: a tick landing after it re-arms the wake
+        with self._lock:
+            latest, self._latest = self._latest, {}
+        return latest
+
+    # ─────────────────────────────────────────────────────
+    # KiteTicker callbacks (websocket thread)
+    # ─────────────────────────────────────────────────────
+    def _on_connect(self, ws, response):
+        ws.subscribe(self.tokens)
+        ws.set_mode(ws.MODE_LTP, self.tokens)
+        logging.info("📡 Tick stream connected: %d instruments", len(self.tokens))
+
+    def _on_ticks(self, ws, ticks):
+        with self._lock:
+            for tick in ticks:
+                self._latest[tick["instrument_token"]] = tick["last_price"]
+        self.wake.set()
+
+    def _on_close(self, ws, code, reason):
+        logging.warning("📡 Tick stream closed: %s %s", code, reason)
+
+    def _on_error(self, ws, code, reason):
+        logging.error("📡 Tick stream error: %s %s", code, reason)
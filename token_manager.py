@@ -6,21 +6,32 @@ and provides token status for the dashboard.
 """
 
 import os
+import re
 import logging
 import time as _time
-from datetime import datetime
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
 from kiteconnect import KiteConnect
 
+from telegram_alerts import send_message as send_telegram_message
+
 load_dotenv()
 
+# Auth-failure keywords, compiled once: one C-level scan per error string
+_AUTH_ERROR_WORDS = (
+    "token", "access", "403", "unauthorized", "invalid",
+    "expired", "session", "login", "incorrect",
+)
+_AUTH_ERROR_RE = re.compile("|".join(_AUTH_ERROR_WORDS))
+_TOKEN_ERROR_RE = re.compile("|".join(_AUTH_ERROR_WORDS + ("api_key",)))
+
 # Shared state
 _token_status = {
     "valid": None,       # True/False/None (unknown)
     "last_check": None,
     "last_error": None,
     "alert_sent_today": False,
-    "alert_date": None,
+    "alert_blocked_until": 0.0,   # Epoch seconds (next local midnight after an alert)
 }
 
 
@@ -29,8 +40,6 @@ def check_token_health(kite=None):
     Quick token health check by calling kite.profile().
     Returns True if token is valid, False if expired/invalid.
     """
-    global _token_status
-
     if kite is None:
         kite = KiteConnect(api_key=os.getenv("KITE_API_KEY"))
         kite.set_access_token(os.getenv("KITE_ACCESS_TOKEN"))
@@ -43,10 +52,7 @@ def check_token_health(kite=None):
         return True
     except Exception as e:
         error_str = str(e).lower()
-        is_auth_error = any(word in error_str for word in [
-            "token", "access", "403", "unauthorized", "invalid",
-            "expired", "session", "login", "incorrect"
-        ])
+        is_auth_error = _AUTH_ERROR_RE.search(error_str) is not None
 
         _token_status["valid"] = False
         _token_status["last_check"] = datetime.now().isoformat()
@@ -60,18 +66,11 @@ def check_token_health(kite=None):
 
 def _send_token_alert(error_msg):
     """Send Telegram alert with login URL (once per day max)."""
-    global _token_status
-
-    today = datetime.now().strftime("%Y-%m-%d")
-
     # Don't spam — only send once per day
-    if _token_status["alert_sent_today"] and _token_status["alert_date"] == today:
+    if _time.time() < _token_status["alert_blocked_until"]:
         return
 
     try:
-        from telegram_alerts import send_message as send_telegram_message
-
-        api_key = os.getenv("KITE_API_KEY")
         dashboard_url = os.getenv("RENDER_EXTERNAL_URL", "http://localhost:5000")
         login_url = f"{dashboard_url}/login"
 
@@ -88,7 +87,7 @@ def _send_token_alert(error_msg):
         )
 
         _token_status["alert_sent_today"] = True
-        _token_status["alert_date"] = today
+        _token_status["alert_blocked_until"] = _next_midnight()
 
         logging.warning("🔑 TOKEN EXPIRED — Telegram alert sent with login URL")
 
@@ -99,10 +98,7 @@ def _send_token_alert(error_msg):
 def is_token_error(exception):
     """Check if an exception is a token/auth error."""
     error_str = str(exception).lower()
-    return any(word in error_str for word in [
-        "token", "access", "403", "unauthorized", "invalid",
-        "expired", "session", "login", "incorrect", "api_key"
-    ])
+    return _TOKEN_ERROR_RE.search(error_str) is not None
 
 
 def handle_api_error(exception, context=""):
@@ -134,4 +130,10 @@ def get_token_status():
 def reset_daily_alert():
     """Reset the daily alert flag (call on new day)."""
     _token_status["alert_sent_today"] = False
-    _token_status["alert_date"] = None
+    _token_status["alert_blocked_until"] = 0.0
+
+
+def _next_midnight():
+    """Epoch seconds of the next local midnight."""
+    tomorrow = datetime.now().date() + timedelta(days=1)
+    return datetime(tomorrow.year, tomorrow.month, tomorrow.day).timestamp()